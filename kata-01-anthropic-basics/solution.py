@@ -9,42 +9,38 @@ Prerequisites:
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
 import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+import httpx
 from dotenv import load_dotenv
-from anthropic import Anthropic, APIError, AuthenticationError, RateLimitError
+from anthropic import Anthropic, AsyncAnthropic, APIError, AuthenticationError, RateLimitError
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.colors import Colors  # noqa: E402
+from workshop.common.pricing import estimate_cost  # noqa: E402
+
 # Default model - Claude Haiku for fast, cost-effective responses
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"
 
+# HTTP connection pool limits for the shared client
+ANTHROPIC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "1000"))
+ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", "100"))
 
-# ANSI color codes for terminal output
-class Colors:
-    """ANSI color codes for pretty terminal output."""
-    HEADER = '\033[96m'      # Cyan - step headers
-    PROMPT = '\033[93m'      # Yellow - user prompts
-    RESPONSE = '\033[92m'    # Green - AI responses
-    STATS = '\033[95m'       # Magenta - statistics
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
-
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
+# Prompts above this many input tokens are rejected before calling the model
+MAX_INPUT_TOKENS = 4096
 
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
+# Static output decorations, built once at import
+_BANNER = Colors.header("=" * 70)
+_FOOTER_BANNER = Colors.header("\n" + "=" * 70)
+_DIVIDER = "-" * 40
 
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
 
 # Token tracking for cumulative usage
 class TokenTracker:
@@ -52,89 +48,187 @@ class TokenTracker:
     def __init__(self):
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cache_creation_tokens = 0
+        self.total_cache_read_tokens = 0
         self.call_count = 0
+        # model_id -> [input, output, cache_creation, cache_read] token counts
+        self.usage_by_model = {}
+        # Most recent call, for per-call cost reporting
+        self.last_model = None
+        self.last_usage = (0, 0, 0, 0)
 
-    def add(self, response):
+    def add(self, response, model=DEFAULT_MODEL):
         """Add tokens from a response to the running total."""
-        self.total_input_tokens += response.usage.input_tokens
-        self.total_output_tokens += response.usage.output_tokens
+        usage = response.usage
+        cache_creation = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+
+        self.total_input_tokens += usage.input_tokens
+        self.total_output_tokens += usage.output_tokens
+        self.total_cache_creation_tokens += cache_creation
+        self.total_cache_read_tokens += cache_read
         self.call_count += 1
 
+        counts = self.usage_by_model.setdefault(model, [0, 0, 0, 0])
+        counts[0] += usage.input_tokens
+        counts[1] += usage.output_tokens
+        counts[2] += cache_creation
+        counts[3] += cache_read
+
+        self.last_model = model
+        self.last_usage = (usage.input_tokens, usage.output_tokens, cache_creation, cache_read)
+
+    def last_call_cost(self):
+        """Get the estimated cost of the most recently added call."""
+        if self.last_model is None:
+            return 0.0
+        return estimate_cost(self.last_model, *self.last_usage)
+
     def get_summary(self):
         """Get summary of all token usage."""
-        # Sonnet pricing: $3 input / $15 output per MTok
-        input_cost = self.total_input_tokens * 0.003 / 1000
-        output_cost = self.total_output_tokens * 0.015 / 1000
-        total_cost = input_cost + output_cost
+        # Price each model's tokens at that model's rates
+        total_cost = sum(
+            estimate_cost(model, *counts) for model, counts in self.usage_by_model.items()
+        )
         return {
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
             "total_tokens": self.total_input_tokens + self.total_output_tokens,
+            "cache_creation_tokens": self.total_cache_creation_tokens,
+            "cache_read_tokens": self.total_cache_read_tokens,
             "api_calls": self.call_count,
             "estimated_cost": total_cost
         }
 
+    async def preflight(self, messages, system=None, model=DEFAULT_MODEL, client=None):
+        """
+        Count input tokens for a request without generating a response.
+
+        Uses the messages.count_tokens endpoint, which is free and exact
+        (including the system prompt), unlike a len(text) // 4 estimate.
+
+        Returns:
+            The number of input tokens the request would use.
+        """
+        client = client or get_async_client()
+        kwargs = {"system": system} if system is not None else {}
+        result = await client.messages.count_tokens(model=model, messages=messages, **kwargs)
+        return result.input_tokens
+
 # Global tracker instance
 tracker = TokenTracker()
 
 
-def basic_message():
-    """Send a basic message to Claude and get a response."""
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Return the shared Anthropic client.
+
+    Creating the client once lets every demo reuse the same HTTP
+    connection pool instead of opening a new TLS session per call.
+    """
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(120.0),
+    )
     # Initialize the Anthropic client (uses ANTHROPIC_API_KEY env var)
-    client = Anthropic()
+    return Anthropic(http_client=http_client)
+
+
+@lru_cache(maxsize=1)
+def get_async_client():
+    """
+    Return the shared async Anthropic client.
+
+    The async client lets independent demos run concurrently on one
+    event loop instead of waiting for each other.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(120.0),
+    )
+    return AsyncAnthropic(http_client=http_client)
+
+
+async def basic_message(client=None):
+    """Send a basic message to Claude and get a response."""
+    client = client or get_async_client()
+    messages = [
+        {"role": "user", "content": "What is the capital of France? Answer in one sentence."}
+    ]
+
+    # Check the prompt size before paying for a generation
+    input_tokens = await tracker.preflight(messages, client=client)
+    if input_tokens > MAX_INPUT_TOKENS:
+        return f"Error: Prompt is {input_tokens} tokens (limit {MAX_INPUT_TOKENS})."
 
     # Create a message request
-    response = client.messages.create(
+    response = await client.messages.create(
         model=DEFAULT_MODEL,
         max_tokens=1024,
-        messages=[
-            {"role": "user", "content": "What is the capital of France? Answer in one sentence."}
-        ]
+        messages=messages
     )
 
     # Track token usage
-    tracker.add(response)
+    tracker.add(response, DEFAULT_MODEL)
 
     # Extract and return the text response
     return response.content[0].text
 
 
-def message_with_system_prompt(user_message: str, system_prompt: str):
+async def message_with_system_prompt(user_message: str, system_prompt: str, client=None):
     """
     Send a message with a system prompt.
 
     Args:
         user_message: The user's question or request.
         system_prompt: Instructions for how Claude should behave.
+        client: Optional AsyncAnthropic client (defaults to the shared client).
 
     Returns:
         The model's text response.
     """
-    client = Anthropic()
+    client = client or get_async_client()
+    messages = [
+        {"role": "user", "content": user_message}
+    ]
+
+    # Check the prompt size (system prompt included) before generating
+    input_tokens = await tracker.preflight(messages, system=system_prompt, client=client)
+    if input_tokens > MAX_INPUT_TOKENS:
+        return f"Error: Prompt is {input_tokens} tokens (limit {MAX_INPUT_TOKENS})."
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model=DEFAULT_MODEL,
         max_tokens=1024,
         system=system_prompt,  # System prompt sets the context/behavior
-        messages=[
-            {"role": "user", "content": user_message}
-        ]
+        messages=messages
     )
 
     # Track token usage
-    tracker.add(response)
+    tracker.add(response, DEFAULT_MODEL)
 
     return response.content[0].text
 
 
-def streaming_response(prompt: str):
+def streaming_response(prompt: str, client=None):
     """
     Stream a response from Claude in real-time.
 
     This is useful for long responses where you want to show
     output as it's generated rather than waiting for the complete response.
+
+    Returns:
+        The full response text.
     """
-    client = Anthropic()
+    client = client or get_client()
+    chunks = []
 
     # Use context manager for streaming
     with client.messages.stream(
@@ -144,13 +238,17 @@ def streaming_response(prompt: str):
     ) as stream:
         # Iterate over text chunks as they arrive
         for text in stream.text_stream:
-            print(text, end="", flush=True)
+            chunks.append(text)  # list + join is linear; text += chunk is not
+            sys.stdout.write(Colors.response(text))
+            sys.stdout.flush()
 
     # Track token usage from the final message
-    tracker.add(stream.get_final_message())
+    tracker.add(stream.get_final_message(), DEFAULT_MODEL)
+
+    return "".join(chunks)
 
 
-def get_token_usage(prompt: str):
+async def get_token_usage(prompt: str, client=None):
     """
     Get token usage statistics for a request.
 
@@ -160,53 +258,55 @@ def get_token_usage(prompt: str):
     - Optimize prompt length
 
     Returns:
-        Dict with input_tokens and output_tokens counts.
+        Dict with input_tokens and output_tokens counts and estimated cost.
     """
-    client = Anthropic()
+    client = client or get_async_client()
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model=DEFAULT_MODEL,
         max_tokens=256,
         messages=[{"role": "user", "content": prompt}]
     )
 
-    # Track token usage
-    tracker.add(response)
+    # Track token usage (read the cost right away - other demos run concurrently)
+    tracker.add(response, DEFAULT_MODEL)
 
     return {
         "input_tokens": response.usage.input_tokens,
-        "output_tokens": response.usage.output_tokens
+        "output_tokens": response.usage.output_tokens,
+        "cost": tracker.last_call_cost()
     }
 
 
-def multi_turn_conversation():
+# Conversation history for the multi-turn demo (static - never mutate)
+_MULTI_TURN_MESSAGES = [
+    {"role": "user", "content": "My name is Alice and I like weather."},
+    {"role": "assistant", "content": "Nice to meet you, Alice! It's great that you're interested in weather. Is there anything specific about weather you'd like to discuss?"},
+    {"role": "user", "content": "What's my name and what do I like?"},
+]
+
+
+async def multi_turn_conversation(client=None):
     """
     Demonstrate a multi-turn conversation with message history.
 
     The messages list maintains conversation context.
     """
-    client = Anthropic()
-
-    # Conversation history
-    messages = [
-        {"role": "user", "content": "My name is Alice and I like weather."},
-        {"role": "assistant", "content": "Nice to meet you, Alice! It's great that you're interested in weather. Is there anything specific about weather you'd like to discuss?"},
-        {"role": "user", "content": "What's my name and what do I like?"},
-    ]
+    client = client or get_async_client()
 
-    response = client.messages.create(
+    response = await client.messages.create(
         model=DEFAULT_MODEL,
         max_tokens=256,
-        messages=messages
+        messages=_MULTI_TURN_MESSAGES
     )
 
     # Track token usage
-    tracker.add(response)
+    tracker.add(response, DEFAULT_MODEL)
 
     return response.content[0].text
 
 
-def handle_errors():
+async def handle_errors(client=None):
     """
     Demonstrate proper error handling with the Anthropic API.
 
@@ -215,16 +315,16 @@ def handle_errors():
     - RateLimitError: Too many requests
     - APIError: General API errors
     """
-    client = Anthropic()
+    client = client or get_async_client()
 
     try:
-        response = client.messages.create(
+        response = await client.messages.create(
             model=DEFAULT_MODEL,
             max_tokens=256,
             messages=[{"role": "user", "content": "Hello!"}]
         )
         # Track token usage
-        tracker.add(response)
+        tracker.add(response, DEFAULT_MODEL)
         return f"Success: {response.content[0].text}"
 
     except AuthenticationError:
@@ -237,72 +337,89 @@ def handle_errors():
         return f"Error: API error - {e}"
 
 
+async def _run_all(client):
+    """Run the independent (non-streaming) demos concurrently."""
+    return await asyncio.gather(
+        basic_message(client),
+        message_with_system_prompt(
+            user_message="What causes rain?",
+            system_prompt="You are a weather expert. Be concise and use simple language.",
+            client=client,
+        ),
+        get_token_usage("Hello, how are you today?", client),
+        multi_turn_conversation(client),
+        handle_errors(client),
+    )
+
+
 def main():
     """Run all the demos."""
-    print(Colors.header("=" * 70))
+    print(_BANNER)
     print(Colors.header(" Kata 01: Anthropic API Basics - Solution"))
-    print(Colors.header("=" * 70))
+    print(_BANNER)
+
+    # One client for the whole session - connections are reused across demos
+    client = get_client()
+
+    # Tests 1, 2, 4, 5 and 6 are independent, so send them all at once and
+    # print the results in order below. Streaming (Test 3) runs on its own
+    # because its output has to appear sequentially.
+    (
+        basic_response,
+        system_response,
+        usage,
+        multi_turn_response,
+        error_result,
+    ) = asyncio.run(_run_all(get_async_client()))
 
     # Test 1: Basic message
     print(Colors.header("\n1. Basic Message"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Prompt: 'What is the capital of France? Answer in one sentence.'"))
-    response = basic_message()
-    print(Colors.response(f"Response: {response}"))
+    print(Colors.response(f"Response: {basic_response}"))
 
     # Test 2: System prompt
     print(Colors.header("\n2. Message with System Prompt"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("System: 'You are a weather expert. Be concise and use simple language.'"))
     print(Colors.prompt("Prompt: 'What causes rain?'"))
-    response = message_with_system_prompt(
-        user_message="What causes rain?",
-        system_prompt="You are a weather expert. Be concise and use simple language."
-    )
-    print(Colors.response(f"Response: {response}"))
+    print(Colors.response(f"Response: {system_response}"))
 
     # Test 3: Streaming
     print(Colors.header("\n3. Streaming Response"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Prompt: 'Count from 1 to 5, with a brief pause description between each number.'"))
-    print(f"{Colors.RESPONSE}Response: ", end="")
-    streaming_response("Count from 1 to 5, with a brief pause description between each number.")
-    print(Colors.RESET)
+    print(Colors.response("Response: "), end="")
+    streaming_response("Count from 1 to 5, with a brief pause description between each number.", client)
+    print()
 
     # Test 4: Token usage
     print(Colors.header("\n4. Token Usage"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Prompt: 'Hello, how are you today?'"))
-    usage = get_token_usage("Hello, how are you today?")
     print(Colors.stats(f"Input tokens: {usage['input_tokens']}"))
     print(Colors.stats(f"Output tokens: {usage['output_tokens']}"))
 
-    # Estimate cost (Sonnet pricing: $3 input / $15 output per MTok)
-    input_cost = usage['input_tokens'] * 0.003 / 1000
-    output_cost = usage['output_tokens'] * 0.015 / 1000
-    total_cost = input_cost + output_cost
-    print(Colors.stats(f"Estimated cost: ${total_cost:.6f}"))
+    print(Colors.stats(f"Estimated cost: ${usage['cost']:.6f}"))
 
     # Test 5: Multi-turn conversation
     print(Colors.header("\n5. Multi-turn Conversation"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Turn 1 - User: 'My name is Alice and I like weather.'"))
     print(Colors.response("Turn 1 - Assistant: 'Nice to meet you, Alice! ...'"))
     print(Colors.prompt("Turn 2 - User: 'What's my name and what do I like?'"))
-    response = multi_turn_conversation()
-    print(Colors.response(f"Turn 2 - Response: {response}"))
+    print(Colors.response(f"Turn 2 - Response: {multi_turn_response}"))
 
     # Test 6: Error handling
     print(Colors.header("\n6. Error Handling"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Testing error handling with a simple 'Hello!' message..."))
-    result = handle_errors()
-    print(Colors.response(f"Result: {result}"))
+    print(Colors.response(f"Result: {error_result}"))
 
     # Summary: Total token usage across all demos
-    print(Colors.header("\n" + "=" * 70))
+    print(_FOOTER_BANNER)
     print(Colors.header(" SESSION SUMMARY"))
-    print(Colors.header("=" * 70))
+    print(_BANNER)
     summary = tracker.get_summary()
     print(Colors.stats(f"Total API calls:    {summary['api_calls']}"))
     print(Colors.stats(f"Total input tokens: {summary['total_input_tokens']}"))
@@ -310,9 +427,9 @@ def main():
     print(Colors.stats(f"Total tokens:       {summary['total_tokens']}"))
     print(Colors.stats(f"Estimated cost:     ${summary['estimated_cost']:.6f}"))
 
-    print(Colors.header("\n" + "=" * 70))
+    print(_FOOTER_BANNER)
     print(Colors.header(" Kata 01 Complete!"))
-    print(Colors.header("=" * 70))
+    print(_BANNER)
 
 
 if __name__ == "__main__":
@@ -9,47 +9,21 @@ Prerequisites:
 """
 
 import os
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.colors import Colors  # noqa: E402
+
 # Default model - Claude Haiku for fast, cost-effective responses
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"
 
 
-# ANSI color codes for terminal output
-class Colors:
-    """ANSI color codes for pretty terminal output."""
-    HEADER = '\033[96m'      # Cyan - step headers
-    PROMPT = '\033[93m'      # Yellow - user prompts
-    RESPONSE = '\033[92m'    # Green - AI responses
-    STATS = '\033[95m'       # Magenta - statistics
-    TODO = '\033[91m'        # Red - TODO items
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
-
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
-
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
-
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
-
-    @classmethod
-    def todo(cls, text):
-        return f"{cls.TODO}{text}{cls.RESET}"
-
-
 # TODO 0: Create a TokenTracker class to track cumulative token usage
 # Hint: Track total_input_tokens, total_output_tokens, and call_count
 # Hint: Add an add(response) method to accumulate usage from each API call
@@ -67,7 +41,7 @@ class TokenTracker:
 
     def get_summary(self):
         # TODO: Return dict with totals and estimated cost
-        # Sonnet pricing: $3 input / $15 output per MTok
+        # Haiku 4.5 pricing: $1 input / $5 output per MTok
         return {
             "total_input_tokens": self.total_input_tokens,
             "total_output_tokens": self.total_output_tokens,
@@ -113,6 +87,7 @@ def streaming_response(prompt: str):
     # TODO 7: Use client.messages.stream() to get streaming response
     # Hint: Use "with client.messages.stream(...) as stream:"
     # Hint: Then iterate over stream.text_stream
+    # Hint: Print each chunk as Colors.response(text) with end="" and flush=True
 
     pass
 
@@ -180,9 +155,9 @@ def main():
     print(Colors.header("\n3. Streaming Response"))
     print("-" * 40)
     print(Colors.prompt("Prompt: 'Count from 1 to 5 slowly.'"))
-    print(f"{Colors.RESPONSE}Response: ", end="")
+    print(Colors.response("Response: "), end="")
     streaming_response("Count from 1 to 5 slowly.")
-    print(Colors.RESET)
+    print()
 
     # Test 4: Token usage
     print(Colors.header("\n4. Token Usage"))
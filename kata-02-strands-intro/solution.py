@@ -9,51 +9,124 @@ Prerequisites:
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
+import copy
+import hashlib
+import json
 import os
+import sys
 import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from strands import Agent
-from strands.models.anthropic import AnthropicModel
-from anthropic import Anthropic
+
+# Heavy SDK imports (strands, anthropic, httpx pull in pydantic and friends)
+# are deferred to the functions that use them to keep startup fast.
+if TYPE_CHECKING:
+    from anthropic import Anthropic, AsyncAnthropic
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.colors import Colors  # noqa: E402
+from workshop.common.pricing import MODEL_PRICING, estimate_cost  # noqa: E402
+
 # Default model configuration
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"  # Fast, cost-effective for workshop
 COMPARISON_MODEL = "claude-sonnet-4-20250514"  # For model comparison demo
 
-# Model pricing (per million tokens) - as of 2024
-MODEL_PRICING = {
-    "claude-sonnet-4-20250514": {"input": 3.00, "output": 15.00, "name": "Sonnet 4"},
-    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00, "name": "Haiku 4.5"},
-}
+# HTTP connection pool limits for the shared Anthropic client
+ANTHROPIC_MAX_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_CONNECTIONS", "1000"))
+ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS", "100"))
+
+# Abort a streaming response if no chunk arrives within this many seconds
+STREAM_IDLE_TIMEOUT = 30.0
+
+# Prompts above this many input tokens are rejected before calling any model
+MAX_INPUT_TOKENS = 4096
+
+# Message Batches are billed at half the realtime price; results are polled
+BATCH_DISCOUNT = 0.5
+BATCH_POLL_INTERVAL = 10.0
+
+# Local cache of deterministic (temperature=0) agent answers, see cached_call()
+LLM_CACHE_DIR = Path(__file__).resolve().parent / ".llm_cache"
+
+# Static output decorations, built once at import
+_BANNER = Colors.header("=" * 70)
+_FOOTER_BANNER = Colors.header("\n" + "=" * 70)
+_DIVIDER = "-" * 40
+
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Return the shared Anthropic client with a tuned connection pool.
+
+    Repeated calls (e.g. in compare_models_batch) reuse the same TCP+TLS
+    sessions instead of opening new connections each time.
+    """
+    import httpx
+    from anthropic import Anthropic
+
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(120.0),
+    )
+    return Anthropic(http_client=http_client)
+
 
+def _build_async_client():
+    """
+    Create an AsyncAnthropic client with the tuned connection pool.
 
-# ANSI color codes for terminal output
-class Colors:
-    """ANSI color codes for pretty terminal output."""
-    HEADER = '\033[96m'      # Cyan - step headers
-    PROMPT = '\033[93m'      # Yellow - user prompts
-    RESPONSE = '\033[92m'    # Green - AI responses
-    STATS = '\033[95m'       # Magenta - statistics/model info
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
+    Async clients are tied to the event loop that uses them, so one is
+    built per asyncio.run() instead of being cached like get_client().
+    """
+    import httpx
+    from anthropic import AsyncAnthropic
+
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(120.0),
+    )
+    return AsyncAnthropic(http_client=http_client)
 
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
 
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
+async def _count_tokens(client, messages, model_ids):
+    """Count input tokens for every model concurrently (one round trip of latency)."""
+    counts = await asyncio.gather(*(
+        client.messages.count_tokens(model=model_id, messages=messages)
+        for model_id in model_ids
+    ))
+    return {model_id: count.input_tokens for model_id, count in zip(model_ids, counts)}
 
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
 
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
+@lru_cache(maxsize=None)
+def get_model(model_id: str, max_tokens: int, temperature: float = None):
+    """
+    Return a shared AnthropicModel for the given configuration.
+
+    Models hold no conversation state (agents do), so agents with the same
+    settings can share one model and its HTTP connection pool.
+    """
+    from strands.models.anthropic import AnthropicModel
+
+    if temperature is None:
+        return AnthropicModel(model_id=model_id, max_tokens=max_tokens)
+    return AnthropicModel(
+        model_id=model_id,
+        max_tokens=max_tokens,
+        params={"temperature": temperature},
+    )
 
 
 def create_basic_agent():
@@ -63,11 +136,10 @@ def create_basic_agent():
     Returns:
         A configured Strands Agent instance.
     """
-    # Create the model provider
-    model = AnthropicModel(
-        model_id=DEFAULT_MODEL,
-        max_tokens=1024
-    )
+    from strands import Agent
+
+    # Get the (shared) model provider - temperature 0 keeps answers repeatable
+    model = get_model(DEFAULT_MODEL, max_tokens=1024, temperature=0.0)
 
     # Create and return the agent
     agent = Agent(model=model)
@@ -83,13 +155,9 @@ def create_agent_with_params():
     - temperature: Controls randomness (0.0-1.0)
     - top_p: Nucleus sampling parameter
     """
-    model = AnthropicModel(
-        model_id=DEFAULT_MODEL,
-        max_tokens=1024,
-        params={
-            "temperature": 0.7,
-        }
-    )
+    from strands import Agent
+
+    model = get_model(DEFAULT_MODEL, max_tokens=1024, temperature=0.7)
 
     agent = Agent(model=model)
     return agent
@@ -101,10 +169,9 @@ def agent_with_system_prompt():
 
     System prompts define the agent's personality, role, and behavior.
     """
-    model = AnthropicModel(
-        model_id=DEFAULT_MODEL,
-        max_tokens=1024
-    )
+    from strands import Agent
+
+    model = get_model(DEFAULT_MODEL, max_tokens=1024)
 
     # Create agent with a weather-focused system prompt
     agent = Agent(
@@ -125,15 +192,144 @@ def multi_turn_conversation(agent):
     allowing for natural back-and-forth dialogue.
     """
     # First message - introduce context
-    response1 = agent("My name is Alice and I study meteorology at university.")
+    response1 = ask_append_only(agent, "My name is Alice and I study meteorology at university.")
 
     # Second message - agent should remember the context
-    response2 = agent("What's my name and what do I study?")
+    response2 = ask_append_only(agent, "What's my name and what do I study?")
 
     return response1, response2
 
 
-def compare_models(prompt: str = "Explain what causes thunder in one sentence."):
+def cached_call(agent, prompt: str) -> str:
+    """
+    Call the agent, reusing a saved answer when the same request was made before.
+
+    Answers are stored on disk under LLM_CACHE_DIR, keyed by a hash of the
+    model config (including max_tokens and sampling params), tools, system
+    prompt, history and prompt, so re-running a demo does not bill the API
+    again. Only temperature=0 agents are cached; anything else is sampled
+    and should not be replayed. A cache hit does not add the turn to
+    agent.messages, so use this for single-turn questions.
+
+    Args:
+        agent: A Strands Agent.
+        prompt: The user message.
+
+    Returns:
+        The agent's answer as text.
+    """
+    config = agent.model.get_config()
+    if (config.get("params") or {}).get("temperature") != 0:
+        return str(agent(prompt))
+
+    # Everything that shapes the answer: the model config carries model_id,
+    # max_tokens and params (temperature, top_p, stop sequences, ...)
+    request = {
+        "config": config,
+        "tools": sorted(agent.tool_names),
+        "system": agent.system_prompt,
+        "messages": agent.messages,
+        "prompt": prompt,
+    }
+    key = hashlib.sha256(json.dumps(request, sort_keys=True, default=str).encode()).hexdigest()
+    path = LLM_CACHE_DIR / f"{key}.json"
+    if path.exists():
+        return json.loads(path.read_text())["response"]
+
+    response = str(agent(prompt))
+    LLM_CACHE_DIR.mkdir(exist_ok=True)
+    path.write_text(json.dumps({"response": response}))
+    return response
+
+
+def ask_append_only(agent, prompt: str):
+    """
+    Call the agent and check that its history only grew by appending.
+
+    Anthropic's prompt cache matches on an exact prefix, so if earlier turns
+    were rewritten (summaries inserted, tool results reordered) the next call
+    would pay full prefill for the whole conversation again. Keep dynamic
+    data (timestamps, run ids) in the new user message, never the system prompt.
+
+    Args:
+        agent: A Strands Agent whose messages list is checked.
+        prompt: The new user message.
+
+    Returns:
+        The agent's response.
+
+    Raises:
+        RuntimeError: If any earlier message changed during the call.
+    """
+    before = copy.deepcopy(agent.messages)
+    response = agent(prompt)
+    if agent.messages[:len(before)] != before:
+        raise RuntimeError("Agent history was rewritten; the cached prompt prefix is lost")
+    return response
+
+
+async def _stream_model(client, model_id: str, messages: list):
+    """Stream one model's answer and return (model_id, stats dict)."""
+    import httpx
+
+    # Time the response using direct Anthropic API for accurate token counts
+    start_time = time.perf_counter()
+    chunks = []
+    async with client.messages.stream(
+        model=model_id,
+        max_tokens=256,
+        messages=messages,
+        # The read timeout is the stall guard: it fires while the socket
+        # sits idle, which a check between received chunks never could
+        timeout=httpx.Timeout(120.0, read=STREAM_IDLE_TIMEOUT),
+    ) as stream:
+        async for text in stream.text_stream:
+            chunks.append(text)
+        final_message = await stream.get_final_message()
+    elapsed_time = time.perf_counter() - start_time
+
+    # Get token usage from the final streamed message
+    input_tokens = final_message.usage.input_tokens
+    output_tokens = final_message.usage.output_tokens
+
+    return model_id, {
+        "name": MODEL_PRICING[model_id]["name"],
+        "response": "".join(chunks),
+        "time": elapsed_time,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost": estimate_cost(model_id, input_tokens, output_tokens)
+    }
+
+
+async def _compare_models_async(prompt: str, client=None):
+    """Preflight and run every model on one event loop."""
+    owns_client = client is None
+    client = client or _build_async_client()
+    model_ids = [DEFAULT_MODEL, COMPARISON_MODEL]
+    messages = [{"role": "user", "content": prompt}]
+
+    try:
+        # Preflight all models at once so an oversized prompt fails before any spend
+        token_counts = await _count_tokens(client, messages, model_ids)
+        for model_id, input_tokens in token_counts.items():
+            if input_tokens > MAX_INPUT_TOKENS:
+                raise ValueError(
+                    f"Prompt is {input_tokens} tokens for {model_id} (limit {MAX_INPUT_TOKENS})"
+                )
+
+        # Fan out the independent API calls - gather() preserves model order
+        results_list = await asyncio.gather(*(
+            _stream_model(client, model_id, messages) for model_id in model_ids
+        ))
+    finally:
+        if owns_client:
+            await client.close()
+
+    return dict(results_list)
+
+
+def compare_models(prompt: str = "Explain what causes thunder in one sentence.", client: "AsyncAnthropic" = None):
     """
     Compare responses from different Claude models with detailed stats.
 
@@ -141,62 +337,105 @@ def compare_models(prompt: str = "Explain what causes thunder in one sentence.")
     - Haiku: Fast, cost-effective for simple tasks
     - Sonnet: Balanced performance for most tasks
 
-    Uses direct Anthropic API for accurate token tracking.
+    Uses direct Anthropic API (streaming) for accurate token tracking.
+    Both models are called concurrently with AsyncAnthropic and
+    asyncio.gather, so total time is roughly the slowest single call
+    rather than the sum of all calls.
+
+    Pass an AsyncAnthropic client to reuse your own (or a mocked) instance;
+    otherwise a pooled client is created for this comparison.
     Returns dict with response, timing, tokens, and cost for each model.
     """
+    return asyncio.run(_compare_models_async(prompt, client))
+
+
+def compare_models_batch(prompt: str = "Explain what causes thunder in one sentence.", client: "Anthropic" = None):
+    """
+    Compare models through the Message Batches API at half the price.
+
+    Batches are processed asynchronously and can take minutes, so this is
+    meant for latency-insensitive runs (python solution.py --batch). Each
+    model's "time" is the wall time until the whole batch ended.
+
+    Returns the same dict shape as compare_models().
+    """
+    client = client or get_client()
+    model_ids = [DEFAULT_MODEL, COMPARISON_MODEL]
+    messages = [{"role": "user", "content": prompt}]
+
+    start_time = time.perf_counter()
+    batch = client.messages.batches.create(requests=[
+        {
+            "custom_id": model_id,
+            "params": {"model": model_id, "max_tokens": 256, "messages": messages},
+        }
+        for model_id in model_ids
+    ])
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.messages.batches.retrieve(batch.id)
+    elapsed_time = time.perf_counter() - start_time
+
     results = {}
-    client = Anthropic()
-
-    for model_id in [DEFAULT_MODEL, COMPARISON_MODEL]:
-        # Time the response using direct Anthropic API for accurate token counts
-        start_time = time.time()
-        response = client.messages.create(
-            model=model_id,
-            max_tokens=256,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        elapsed_time = time.time() - start_time
-
-        # Get token usage directly from response
-        input_tokens = response.usage.input_tokens
-        output_tokens = response.usage.output_tokens
-
-        # Calculate cost
-        pricing = MODEL_PRICING[model_id]
-        cost = (input_tokens * pricing["input"] / 1_000_000) + \
-               (output_tokens * pricing["output"] / 1_000_000)
-
-        results[model_id] = {
-            "name": pricing["name"],
-            "response": response.content[0].text,
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type != "succeeded":
+            raise RuntimeError(f"Batch request for {entry.custom_id} {entry.result.type}")
+        message = entry.result.message
+        input_tokens = message.usage.input_tokens
+        output_tokens = message.usage.output_tokens
+        cost = estimate_cost(entry.custom_id, input_tokens, output_tokens) * BATCH_DISCOUNT
+        results[entry.custom_id] = {
+            "name": MODEL_PRICING[entry.custom_id]["name"],
+            "response": "".join(block.text for block in message.content if block.type == "text"),
             "time": elapsed_time,
             "input_tokens": input_tokens,
             "output_tokens": output_tokens,
             "cost": cost
         }
 
-    return results
+    # Batch results arrive in any order; keep the table order stable
+    return {model_id: results[model_id] for model_id in model_ids}
+
+
+def print_banner(title: str, leading_newline: bool = False):
+    """Print a title between two rules in a single write."""
+    top = _FOOTER_BANNER if leading_newline else _BANNER
+    sys.stdout.write(f"{top}\n{Colors.header(title)}\n{_BANNER}\n")
+
+
+# Comparison table layout - column widths are fixed, so build it once
+_COL_WIDTHS = (12, 10, 10, 10, 12)
+_ROW_FMT = "│" + "│".join(f"{{:^{w}}}" for w in _COL_WIDTHS) + "│"
+_TABLE_TOP = "┌" + "─" * 58 + "┐"
+_TABLE_TITLE = "│" + " MODEL COMPARISON SUMMARY".center(58) + "│"
+_TABLE_HEAD_SEP = "├" + "┬".join("─" * w for w in _COL_WIDTHS) + "┤"
+_TABLE_COLUMNS = _ROW_FMT.format(" Model", " Time", " In Tok", " Out Tok", " Cost")
+_TABLE_ROW_SEP = "├" + "┼".join("─" * w for w in _COL_WIDTHS) + "┤"
+_TABLE_BOTTOM = "└" + "┴".join("─" * w for w in _COL_WIDTHS) + "┘"
 
 
 def print_comparison_table(results: dict):
     """Print a formatted comparison table of model results."""
-    # Table header
-    print(Colors.header("\n┌" + "─" * 58 + "┐"))
-    print(Colors.header("│" + " MODEL COMPARISON SUMMARY".center(58) + "│"))
-    print(Colors.header("├" + "─" * 12 + "┬" + "─" * 10 + "┬" + "─" * 10 + "┬" + "─" * 10 + "┬" + "─" * 12 + "┤"))
-    print(Colors.header("│" + " Model".center(12) + "│" + " Time".center(10) + "│" + " In Tok".center(10) + "│" + " Out Tok".center(10) + "│" + " Cost".center(12) + "│"))
-    print(Colors.header("├" + "─" * 12 + "┼" + "─" * 10 + "┼" + "─" * 10 + "┼" + "─" * 10 + "┼" + "─" * 12 + "┤"))
+    # Build the whole table first and write it in one call
+    lines = [
+        Colors.header("\n" + _TABLE_TOP),
+        Colors.header(_TABLE_TITLE),
+        Colors.header(_TABLE_HEAD_SEP),
+        Colors.header(_TABLE_COLUMNS),
+        Colors.header(_TABLE_ROW_SEP),
+    ]
 
     # Table rows
     for model_id, data in results.items():
-        name = data["name"][:10].center(12)
-        time_str = f"{data['time']:.2f}s".center(10)
-        in_tok = str(data["input_tokens"]).center(10)
-        out_tok = str(data["output_tokens"]).center(10)
-        cost_str = f"${data['cost']:.6f}".center(12)
-        print(Colors.stats(f"│{name}│{time_str}│{in_tok}│{out_tok}│{cost_str}│"))
+        lines.append(Colors.stats(_ROW_FMT.format(
+            data["name"][:10],
+            f"{data['time']:.2f}s",
+            data["input_tokens"],
+            data["output_tokens"],
+            f"${data['cost']:.6f}",
+        )))
 
-    print(Colors.header("└" + "─" * 12 + "┴" + "─" * 10 + "┴" + "─" * 10 + "┴" + "─" * 10 + "┴" + "─" * 12 + "┘"))
+    lines.append(Colors.header(_TABLE_BOTTOM))
 
     # Calculate and show comparisons
     haiku = results.get(DEFAULT_MODEL, {})
@@ -204,33 +443,18 @@ def print_comparison_table(results: dict):
 
     if haiku.get("time") and sonnet.get("time") and haiku["time"] > 0:
         speed_ratio = sonnet["time"] / haiku["time"]
-        print(Colors.stats(f"\n  Haiku is ~{speed_ratio:.1f}x faster than Sonnet"))
+        lines.append(Colors.stats(f"\n  Haiku is ~{speed_ratio:.1f}x faster than Sonnet"))
 
     if haiku.get("cost") and sonnet.get("cost") and haiku["cost"] > 0:
         cost_ratio = sonnet["cost"] / haiku["cost"]
-        print(Colors.stats(f"  Haiku is ~{cost_ratio:.1f}x cheaper than Sonnet"))
-
-    print(Colors.stats("\n  Note: Faster/cheaper doesn't mean better for complex tasks!"))
+        lines.append(Colors.stats(f"  Haiku is ~{cost_ratio:.1f}x cheaper than Sonnet"))
 
+    lines.append(Colors.stats("\n  Note: Faster/cheaper doesn't mean better for complex tasks!"))
+    sys.stdout.write("\n".join(lines) + "\n")
 
-def create_weather_chatbot():
-    """
-    Create a specialized weather chatbot agent.
 
-    This demonstrates a more complete agent configuration
-    for a specific use case.
-    """
-    model = AnthropicModel(
-        model_id=DEFAULT_MODEL,
-        max_tokens=1024,
-        params={
-            "temperature": 0.5,  # Slightly lower for more focused responses
-        }
-    )
-
-    agent = Agent(
-        model=model,
-        system_prompt="""You are WeatherBot, an expert weather assistant.
+# WeatherBot persona - kept byte-identical across turns so it can be cached
+WEATHER_BOT_SYSTEM_PROMPT = """You are WeatherBot, an expert weather assistant.
 
 Your capabilities:
 - Explain weather phenomena clearly
@@ -246,28 +470,68 @@ Your style:
 
 Remember: You don't have access to real-time weather data,
 so explain concepts rather than giving current conditions."""
+
+
+def create_weather_chatbot():
+    """
+    Create a specialized weather chatbot agent.
+
+    This demonstrates a more complete agent configuration for a specific
+    use case. AnthropicModel merges ``params`` into the request last, so
+    the structured system block below (marked with cache_control) replaces
+    the plain string the Agent would send.
+
+    Caching only applies to prefixes above the model's minimum cacheable
+    length (4096 tokens for Haiku 4.5). This ~150-token persona is below
+    it, so the API processes it uncached; the breakpoint starts paying
+    once the persona grows (e.g. with reference material or examples).
+    """
+    from strands import Agent
+    from strands.models.anthropic import AnthropicModel
+
+    model = AnthropicModel(
+        model_id=DEFAULT_MODEL,
+        max_tokens=1024,
+        params={
+            "temperature": 0.5,  # Slightly lower for more focused responses
+            "system": [{
+                "type": "text",
+                "text": WEATHER_BOT_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }],
+        },
+    )
+
+    agent = Agent(
+        model=model,
+        system_prompt=WEATHER_BOT_SYSTEM_PROMPT
     )
 
     return agent
 
 
-def main():
-    """Run all the demos."""
-    print(Colors.header("=" * 70))
-    print(Colors.header(" Kata 02: Strands Agents Introduction - Solution"))
-    print(Colors.header("=" * 70))
+def main(batch: bool = False):
+    """
+    Run all the demos.
+
+    Args:
+        batch: Run the model comparison through the Message Batches API.
+    """
+    from strands import Agent
+
+    print_banner(" Kata 02: Strands Agents Introduction - Solution")
 
     # Test 1: Basic agent
     print(Colors.header("\n1. Basic Agent"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.prompt("Prompt: 'What is the capital of France? Answer briefly.'"))
     agent = create_basic_agent()
-    response = agent("What is the capital of France? Answer briefly.")
+    response = cached_call(agent, "What is the capital of France? Answer briefly.")
     print(Colors.response(f"Agent: {response}"))
 
     # Test 2: Agent with system prompt
     print(Colors.header("\n2. Agent with System Prompt (Weather Assistant)"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.stats("System: 'You are a friendly weather assistant...'"))
     print(Colors.prompt("Prompt: 'Why is the sky blue?'"))
     weather_agent = agent_with_system_prompt()
@@ -276,22 +540,23 @@ def main():
 
     # Test 3: Multi-turn conversation
     print(Colors.header("\n3. Multi-turn Conversation"))
-    print("-" * 40)
+    print(_DIVIDER)
     # Create a fresh agent for this test
-    model = AnthropicModel(model_id=DEFAULT_MODEL, max_tokens=512)
+    model = get_model(DEFAULT_MODEL, max_tokens=512)
     chat_agent = Agent(model=model)
 
+    # Both turns go through ask_append_only, which checks the history is only appended to
+    response1, response2 = multi_turn_conversation(chat_agent)
+
     print(Colors.prompt("User: My name is Alice and I study meteorology at university."))
-    response1 = chat_agent("My name is Alice and I study meteorology at university.")
     print(Colors.response(f"Agent: {response1}"))
 
     print(Colors.prompt("\nUser: What's my name and what do I study?"))
-    response2 = chat_agent("What's my name and what do I study?")
     print(Colors.response(f"Agent: {response2}"))
 
     # Test 4: Specialized chatbot
     print(Colors.header("\n4. Specialized Weather Chatbot"))
-    print("-" * 40)
+    print(_DIVIDER)
     print(Colors.stats("WeatherBot configured with detailed system prompt"))
     weather_bot = create_weather_chatbot()
 
@@ -307,12 +572,15 @@ def main():
 
     # Test 5: Model comparison (moved to end as capstone)
     print(Colors.header("\n5. Model Comparison"))
-    print("-" * 40)
+    print(_DIVIDER)
     comparison_prompt = "Explain what causes thunder in one sentence."
     print(Colors.prompt(f"Prompt: '{comparison_prompt}'"))
-    print(Colors.stats("\nRunning same prompt on Haiku and Sonnet..."))
-
-    results = compare_models(comparison_prompt)
+    if batch:
+        print(Colors.stats("\nSubmitting Haiku and Sonnet as one batch (50% price, may take minutes)..."))
+        results = compare_models_batch(comparison_prompt)
+    else:
+        print(Colors.stats("\nRunning same prompt on Haiku and Sonnet..."))
+        results = compare_models(comparison_prompt)
 
     # Show individual responses
     for model_id, data in results.items():
@@ -322,10 +590,8 @@ def main():
     # Show comparison table
     print_comparison_table(results)
 
-    print(Colors.header("\n" + "=" * 70))
-    print(Colors.header(" Kata 02 Complete!"))
-    print(Colors.header("=" * 70))
+    print_banner(" Kata 02 Complete!", leading_newline=True)
 
 
 if __name__ == "__main__":
-    main()
+    main(batch="--batch" in sys.argv[1:])
@@ -9,53 +9,22 @@ Prerequisites:
 """
 
 import os
+import sys
 import time
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.colors import Colors  # noqa: E402
+from workshop.common.pricing import MODEL_PRICING  # noqa: E402,F401 - used in the TODOs
+
 # Default model configuration
 DEFAULT_MODEL = "claude-haiku-4-5-20251001"  # Fast, cost-effective for workshop
 COMPARISON_MODEL = "claude-sonnet-4-20250514"  # For model comparison demo
 
-# Model pricing (per million tokens)
-MODEL_PRICING = {
-    "claude-sonnet-4-20250514": {"input": 3.00, "output": 15.00, "name": "Sonnet 4"},
-    "claude-haiku-4-5-20251001": {"input": 0.80, "output": 4.00, "name": "Haiku 4.5"},
-}
-
-
-# ANSI color codes for terminal output
-class Colors:
-    """ANSI color codes for pretty terminal output."""
-    HEADER = '\033[96m'      # Cyan - step headers
-    PROMPT = '\033[93m'      # Yellow - user prompts
-    RESPONSE = '\033[92m'    # Green - AI responses
-    STATS = '\033[95m'       # Magenta - statistics/model info
-    TODO = '\033[91m'        # Red - TODO items
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
-
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
-
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
-
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
-
-    @classmethod
-    def todo(cls, text):
-        return f"{cls.TODO}{text}{cls.RESET}"
-
 
 def create_basic_agent():
     """Create a basic Strands agent with Anthropic."""
@@ -88,6 +57,8 @@ def multi_turn_conversation(agent):
     """Demonstrate multi-turn conversation with context retention."""
     # TODO 6: Send multiple messages to the same agent
     # The agent should remember context from previous messages
+    # Tip: history should only ever be appended to - Anthropic's prompt cache
+    # matches on an exact prefix, so rewriting earlier turns forfeits it
 
     # First message
     response1 = None  # agent("My name is Alice and I study weather.")
@@ -104,28 +75,50 @@ def compare_models(prompt: str = "Explain what causes thunder in one sentence.")
 
     TODO 7: Implement model comparison with stats tracking
     Uses direct Anthropic API for accurate token counts.
+    The calls are independent, so run them concurrently - total time is
+    then the slowest call instead of the sum of both.
 
     Returns dict with model_id -> {name, response, time, input_tokens, output_tokens, cost}
     """
-    # TODO: Import Anthropic client
-    # from anthropic import Anthropic
-    # client = Anthropic()
+    # TODO: Import the async Anthropic client
+    # import asyncio
+    # from anthropic import AsyncAnthropic
 
     results = {}
 
-    # TODO: Loop through [DEFAULT_MODEL, COMPARISON_MODEL]
-    # For each model:
-    #   1. Time the API call: start = time.time()
-    #   2. Call: response = client.messages.create(model=model_id, max_tokens=256, messages=[...])
-    #   3. elapsed = time.time() - start
-    #   4. Get tokens: response.usage.input_tokens, response.usage.output_tokens
-    #   5. Calculate cost using MODEL_PRICING
-    #   6. Store in results dict with keys: name, response, time, input_tokens, output_tokens, cost
+    # TODO: Write a coroutine for one model:
+    #   async def _one(client, model_id):
+    #       1. Time the API call: start = time.perf_counter()
+    #       2. Call: response = await client.messages.create(model=model_id, max_tokens=256, messages=[...])
+    #       3. elapsed = time.perf_counter() - start
+    #       4. return model_id, response, elapsed
+    #
+    # TODO: Run both models at once:
+    #   async def _all():
+    #       async with AsyncAnthropic() as client:
+    #           return await asyncio.gather(*[_one(client, m) for m in [DEFAULT_MODEL, COMPARISON_MODEL]])
+    #   for model_id, response, elapsed in asyncio.run(_all()):
+    #       1. Get tokens: response.usage.input_tokens, response.usage.output_tokens
+    #       2. Calculate cost using MODEL_PRICING
+    #       3. Store in results dict with keys: name, response, time, input_tokens, output_tokens, cost
 
     # Placeholder return - replace with actual implementation
     return results
 
 
+# Comparison table layout - column widths are fixed, so build it once
+_COL_WIDTHS = (12, 10, 10, 10, 12)
+_ROW_FMT = "│" + "│".join(f"{{:^{w}}}" for w in _COL_WIDTHS) + "│"
+_TABLE_HEADER = "\n".join(Colors.header(line) for line in (
+    "\n┌" + "─" * 58 + "┐",
+    "│" + " MODEL COMPARISON SUMMARY".center(58) + "│",
+    "├" + "┬".join("─" * w for w in _COL_WIDTHS) + "┤",
+    _ROW_FMT.format(" Model", " Time", " In Tok", " Out Tok", " Cost"),
+    "├" + "┼".join("─" * w for w in _COL_WIDTHS) + "┤",
+))
+_TABLE_BOTTOM = Colors.header("└" + "┴".join("─" * w for w in _COL_WIDTHS) + "┘")
+
+
 def print_comparison_table(results: dict):
     """Print a formatted comparison table of model results."""
     if not results:
@@ -133,22 +126,19 @@ def print_comparison_table(results: dict):
         return
 
     # Table header
-    print(Colors.header("\n┌" + "─" * 58 + "┐"))
-    print(Colors.header("│" + " MODEL COMPARISON SUMMARY".center(58) + "│"))
-    print(Colors.header("├" + "─" * 12 + "┬" + "─" * 10 + "┬" + "─" * 10 + "┬" + "─" * 10 + "┬" + "─" * 12 + "┤"))
-    print(Colors.header("│" + " Model".center(12) + "│" + " Time".center(10) + "│" + " In Tok".center(10) + "│" + " Out Tok".center(10) + "│" + " Cost".center(12) + "│"))
-    print(Colors.header("├" + "─" * 12 + "┼" + "─" * 10 + "┼" + "─" * 10 + "┼" + "─" * 10 + "┼" + "─" * 12 + "┤"))
+    print(_TABLE_HEADER)
 
     # Table rows
     for model_id, data in results.items():
-        name = data["name"][:10].center(12)
-        time_str = f"{data['time']:.2f}s".center(10)
-        in_tok = str(data["input_tokens"]).center(10)
-        out_tok = str(data["output_tokens"]).center(10)
-        cost_str = f"${data['cost']:.6f}".center(12)
-        print(Colors.stats(f"│{name}│{time_str}│{in_tok}│{out_tok}│{cost_str}│"))
-
-    print(Colors.header("└" + "─" * 12 + "┴" + "─" * 10 + "┴" + "─" * 10 + "┴" + "─" * 10 + "┴" + "─" * 12 + "┘"))
+        print(Colors.stats(_ROW_FMT.format(
+            data["name"][:10],
+            f"{data['time']:.2f}s",
+            data["input_tokens"],
+            data["output_tokens"],
+            f"${data['cost']:.6f}",
+        )))
+
+    print(_TABLE_BOTTOM)
 
     # Calculate and show comparisons
     haiku = results.get(DEFAULT_MODEL, {})
@@ -5,113 +5,259 @@ This script demonstrates how to create custom tools and integrate them
 with Strands agents, including real API calls.
 
 Prerequisites:
-    pip install 'strands-agents[anthropic]' strands-agents-tools httpx
+    pip install 'strands-agents[anthropic]' strands-agents-tools 'httpx[http2]'
+    pip install selectolax orjson  # optional, faster HTML and JSON parsing
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
 import os
 import random
-from datetime import datetime, timezone
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
-from strands import Agent, tool
-from strands.models.anthropic import AnthropicModel
+from strands import tool
 import httpx
 
+# The Anthropic provider (and the anthropic SDK behind it) is imported by the
+# factories below; only the @tool decorator is needed at import time.
+if TYPE_CHECKING:
+    from strands.models.anthropic import AnthropicModel
+
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.calc import evaluate  # noqa: E402
+from workshop.common.colors import Colors  # noqa: E402
+from workshop.common.units import convert_temp  # noqa: E402
+
+
+# City table for weather lookup and city info, stored as parallel tuples
+# indexed through _CITY_INDEX (keys are lowercase)
+CITY_NAMES = ("london", "paris", "new york", "tokyo", "helsinki", "sydney", "berlin", "amsterdam")
+CITY_LAT = (51.5074, 48.8566, 40.7128, 35.6762, 60.1699, -33.8688, 52.5200, 52.3676)
+CITY_LON = (-0.1278, 2.3522, -74.0060, 139.6503, 24.9384, 151.2093, 13.4050, 4.9041)
+CITY_COUNTRY = ("UK", "France", "USA", "Japan", "Finland", "Australia", "Germany", "Netherlands")
+CITY_POPULATION = ("8.8 million", "2.1 million", "8.3 million", "13.9 million",
+                   "0.6 million", "5.3 million", "3.7 million", "0.9 million")
+CITY_TIMEZONE = ("GMT", "CET", "EST", "JST", "EET", "AEST", "CET", "CET")
+_CITY_INDEX = {name: i for i, name in enumerate(CITY_NAMES)}
+_AVAILABLE_CITIES_STR = ", ".join(CITY_NAMES)
+
+# selectolax is a C-extension HTML parser; the regex scrubber below is the fallback
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# orjson parses API responses straight from bytes, several times faster than json
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# HTML scrubbing patterns, compiled once instead of on every fetch
+_SCRIPT_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE)
+_STYLE_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+_TITLE_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+
+
+def _html_to_text(html: str) -> str:
+    """Strip scripts, styles and tags from HTML and collapse whitespace."""
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        for node in tree.css("script, style"):
+            node.decompose()
+        root = tree.body or tree.root
+        text = root.text(separator=" ") if root is not None else ""
+    else:
+        text = _SCRIPT_RE.sub('', html)
+        text = _STYLE_RE.sub('', text)
+        text = _TAG_RE.sub(' ', text)
+    return _WS_RE.sub(' ', text).strip()
+
+
+# Pages are read up to this many bytes; the agent only ever sees ~3000 chars
+MAX_FETCH_BYTES = 32 * 1024
 
-# ANSI color codes for terminal output
-class Colors:
-    HEADER = '\033[96m'
-    PROMPT = '\033[93m'
-    RESPONSE = '\033[92m'
-    STATS = '\033[95m'
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
-
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
-
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
-
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
-
-
-# City coordinates for weather lookup
-CITY_COORDINATES = {
-    "london": {"lat": 51.5074, "lon": -0.1278, "country": "UK"},
-    "paris": {"lat": 48.8566, "lon": 2.3522, "country": "France"},
-    "new york": {"lat": 40.7128, "lon": -74.0060, "country": "USA"},
-    "tokyo": {"lat": 35.6762, "lon": 139.6503, "country": "Japan"},
-    "helsinki": {"lat": 60.1699, "lon": 24.9384, "country": "Finland"},
-    "sydney": {"lat": -33.8688, "lon": 151.2093, "country": "Australia"},
-    "berlin": {"lat": 52.5200, "lon": 13.4050, "country": "Germany"},
-    "amsterdam": {"lat": 52.3676, "lon": 4.9041, "country": "Netherlands"},
+_FETCH_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; Workshop-Agent/1.0)"
 }
 
 
+# Shared connection pool for all tool HTTP calls
+HTTP_MAX_CONNECTIONS = 20
+
+# Open-Meteo API - free, no API key required
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+_OPEN_METEO_CURRENT = "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m"
+
+
+# An AsyncClient's pool is bound to the event loop it first runs on, while
+# each agent invocation may run on its own loop. So one client lives on a
+# dedicated background loop and every request is handed to that loop, which
+# lets the pool (and its open TCP+TLS sessions) outlive any one agent call.
+_HTTP_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_HTTP_LOOP.run_forever, name="http-client", daemon=True).start()
+_http_client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the pooled HTTP/2 client, creating it on first use (HTTP loop only)."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+            ),
+            headers=_FETCH_HEADERS,
+        )
+    return _http_client
+
+
+async def _on_http_loop(coro):
+    """Await coro on the HTTP client's loop and return its result.
+
+    Tools are async so Strands can run parallel tool calls concurrently;
+    their requests still overlap, just on the shared loop.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _HTTP_LOOP)
+    return await asyncio.wrap_future(future)
+
+
+async def _http_get(url: str, **kwargs) -> httpx.Response:
+    """GET url with the shared client (HTTP loop only)."""
+    return await get_http_client().get(url, **kwargs)
+
+
+def close_http_client():
+    """Close the shared HTTP client and its pooled connections."""
+    async def _close():
+        global _http_client
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+
+    asyncio.run_coroutine_threadsafe(_close(), _HTTP_LOOP).result()
+
+
+# Short-lived result caches: Open-Meteo "current" data only changes every
+# few minutes, and agents often repeat the same lookup within one turn
+WEATHER_CACHE_TTL = 60.0
+WEBPAGE_CACHE_TTL = 300.0
+_WEATHER_CACHE: dict[str, tuple[float, str]] = {}
+_WEBPAGE_CACHE: dict[str, tuple[float, str]] = {}
+
+
+def _cache_get(cache: dict, key, ttl: float):
+    """Return a cached value if it is younger than ttl seconds, else None."""
+    hit = cache.get(key)
+    if hit is not None and time.monotonic() - hit[0] < ttl:
+        return hit[1]
+    return None
+
+
+def _cache_put(cache: dict, key, value: str) -> str:
+    """Store a successful result and return it."""
+    cache[key] = (time.monotonic(), value)
+    return value
+
+
+async def _fetch_html(url: str, timeout: float) -> str:
+    """Stream a page and stop reading once MAX_FETCH_BYTES have arrived.
+
+    Large pages are cut off early instead of being downloaded in full and
+    truncated afterwards, so memory and transfer stay bounded. Pages are
+    cached by URL for WEBPAGE_CACHE_TTL seconds (failed fetches are not).
+    """
+    cached = _cache_get(_WEBPAGE_CACHE, url, WEBPAGE_CACHE_TTL)
+    if cached is not None:
+        return cached
+
+    async def _stream():
+        async with get_http_client().stream("GET", url, timeout=timeout,
+                                            follow_redirects=True) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            async for chunk in response.aiter_bytes():
+                buf.extend(chunk)
+                if len(buf) >= MAX_FETCH_BYTES:
+                    break
+            return buf[:MAX_FETCH_BYTES].decode(response.encoding or "utf-8", errors="replace")
+
+    return _cache_put(_WEBPAGE_CACHE, url, await _on_http_loop(_stream()))
+
+
 # ==============================================================================
 # Tool Definitions
 # ==============================================================================
 
+# Open-Meteo (WMO) weather codes
+_WEATHER_CODES = {
+    0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
+    45: "Fog", 48: "Depositing rime fog",
+    51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
+    61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
+    71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
+    80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
+    95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail",
+}
+
+def _weather_params(i: int) -> dict:
+    """Build Open-Meteo query parameters for the city at table index i."""
+    return {
+        "latitude": CITY_LAT[i],
+        "longitude": CITY_LON[i],
+        "current": _OPEN_METEO_CURRENT,
+        "timezone": "auto"
+    }
+
+
+def _format_weather(city: str, i: int, current: dict) -> str:
+    """Format Open-Meteo 'current' data as a one-line weather report."""
+    temp = current["temperature_2m"]
+    humidity = current["relative_humidity_2m"]
+    wind = current["wind_speed_10m"]
+    weather_code = current["weather_code"]
+
+    # Decode weather code to description
+    condition = _WEATHER_CODES.get(weather_code, f"Weather code {weather_code}")
+
+    return (f"Weather in {city.title()} ({CITY_COUNTRY[i]}): "
+            f"{temp}°C, {condition}, Humidity: {humidity}%, Wind: {wind} km/h")
+
+
 @tool
-def get_weather(city: str) -> str:
+async def get_weather(city: str) -> str:
     """Get the current weather for a city using Open-Meteo API (real data).
 
     Args:
         city: The name of the city to get weather for.
     """
     city_lower = city.lower()
+    i = _CITY_INDEX.get(city_lower)
+    if i is None:
+        return f"City '{city}' not found. Available cities: {_AVAILABLE_CITIES_STR}"
 
-    if city_lower not in CITY_COORDINATES:
-        available = ", ".join(CITY_COORDINATES.keys())
-        return f"City '{city}' not found. Available cities: {available}"
-
-    coords = CITY_COORDINATES[city_lower]
+    cached = _cache_get(_WEATHER_CACHE, city_lower, WEATHER_CACHE_TTL)
+    if cached is not None:
+        return cached
 
     try:
-        # Open-Meteo API - free, no API key required
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {
-            "latitude": coords["lat"],
-            "longitude": coords["lon"],
-            "current": "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m",
-            "timezone": "auto"
-        }
-
-        response = httpx.get(url, params=params, timeout=10.0)
+        response = await _on_http_loop(_http_get(OPEN_METEO_URL, params=_weather_params(i)))
         response.raise_for_status()
-        data = response.json()
-
-        current = data["current"]
-        temp = current["temperature_2m"]
-        humidity = current["relative_humidity_2m"]
-        wind = current["wind_speed_10m"]
-        weather_code = current["weather_code"]
-
-        # Decode weather code to description
-        weather_descriptions = {
-            0: "Clear sky", 1: "Mainly clear", 2: "Partly cloudy", 3: "Overcast",
-            45: "Fog", 48: "Depositing rime fog",
-            51: "Light drizzle", 53: "Moderate drizzle", 55: "Dense drizzle",
-            61: "Slight rain", 63: "Moderate rain", 65: "Heavy rain",
-            71: "Slight snow", 73: "Moderate snow", 75: "Heavy snow",
-            80: "Slight rain showers", 81: "Moderate rain showers", 82: "Violent rain showers",
-            95: "Thunderstorm", 96: "Thunderstorm with slight hail", 99: "Thunderstorm with heavy hail",
-        }
-        condition = weather_descriptions.get(weather_code, f"Weather code {weather_code}")
-
-        return (f"Weather in {city.title()} ({coords['country']}): "
-                f"{temp}°C, {condition}, Humidity: {humidity}%, Wind: {wind} km/h")
+        report = _format_weather(city, i, _json_loads(response.content)["current"])
+        return _cache_put(_WEATHER_CACHE, city_lower, report)
 
     except httpx.TimeoutException:
         return f"Error: Weather API request timed out for {city}"
@@ -122,42 +268,67 @@ def get_weather(city: str) -> str:
 
 
 @tool
-def calculate(expression: str) -> str:
-    """Evaluate a mathematical expression safely.
+async def get_weather_batch(cities: list[str]) -> str:
+    """Get the current weather for several cities in one request (real data).
+
+    Prefer this over repeated get_weather calls when a question mentions
+    more than one city - all cities are fetched with a single API call.
 
     Args:
-        expression: A mathematical expression like '2 + 2', '10 * 5', or 'sqrt(16)'.
+        cities: The names of the cities to get weather for.
     """
-    import math
-
-    try:
-        # Define safe functions and constants
-        safe_dict = {
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "pow": pow,
-            "sqrt": math.sqrt,
-            "sin": math.sin,
-            "cos": math.cos,
-            "tan": math.tan,
-            "pi": math.pi,
-            "e": math.e,
+    reports = {}
+    missing = []
+    for city in dict.fromkeys(city.lower() for city in cities):
+        if city not in _CITY_INDEX:
+            reports[city] = f"City '{city}' not found. Available cities: {_AVAILABLE_CITIES_STR}"
+            continue
+        # Slot is filled in below if the report isn't cached, keeping input order
+        reports[city] = _cache_get(_WEATHER_CACHE, city, WEATHER_CACHE_TTL)
+        if reports[city] is None:
+            missing.append(city)
+
+    if missing:
+        # Open-Meteo accepts comma-separated coordinates and returns one entry per location
+        indices = [_CITY_INDEX[city] for city in missing]
+        params = {
+            "latitude": ",".join(str(CITY_LAT[i]) for i in indices),
+            "longitude": ",".join(str(CITY_LON[i]) for i in indices),
+            "current": _OPEN_METEO_CURRENT,
+            "timezone": "auto"
         }
+        try:
+            response = await _on_http_loop(_http_get(OPEN_METEO_URL, params=params))
+            response.raise_for_status()
+            data = _json_loads(response.content)
+            # A single location comes back as an object rather than a list
+            locations = data if isinstance(data, list) else [data]
+            for city, i, location in zip(missing, indices, locations):
+                report = _format_weather(city, i, location["current"])
+                reports[city] = _cache_put(_WEATHER_CACHE, city, report)
+        except httpx.TimeoutException:
+            return f"Error: Weather API request timed out for {', '.join(missing)}"
+        except httpx.HTTPError as e:
+            return f"Error fetching weather for {', '.join(missing)}: {str(e)}"
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    return "\n".join(reports.values())
 
-        # Only allow safe characters
-        allowed_chars = set("0123456789+-*/.() ,")
-        expression_check = expression
-        for func in safe_dict.keys():
-            expression_check = expression_check.replace(func, "")
 
-        if not all(c in allowed_chars for c in expression_check):
-            return "Error: Expression contains invalid characters"
+@tool
+def calculate(expression: str) -> str:
+    """Evaluate a mathematical expression safely.
 
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
+    Args:
+        expression: A mathematical expression like '2 + 2', '10 * 5', or 'sqrt(16)'.
+    """
+    try:
+        # Walks the parsed tree instead of eval() - only whitelisted nodes run
+        result = evaluate(expression)
         return f"Result: {result}"
+    except SyntaxError:
+        return "Error: Expression contains invalid characters"
     except ZeroDivisionError:
         return "Error: Division by zero"
     except Exception as e:
@@ -171,8 +342,11 @@ def get_current_time(tz_name: str = "UTC") -> str:
     Args:
         tz_name: The timezone name (currently supports UTC only).
     """
-    now = datetime.now(timezone.utc)
-    return f"Current date and time ({tz_name}): {now.strftime('%Y-%m-%d %H:%M:%S')}"
+    # time.gmtime skips datetime's tzinfo and strftime locale handling
+    now = time.gmtime()
+    return (f"Current date and time ({tz_name}): "
+            f"{now.tm_year:04d}-{now.tm_mon:02d}-{now.tm_mday:02d} "
+            f"{now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}")
 
 
 @tool
@@ -184,30 +358,12 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> str:
         from_unit: The source unit (C, F, or K).
         to_unit: The target unit (C, F, or K).
     """
-    from_unit = from_unit.upper()
-    to_unit = to_unit.upper()
-
-    # Convert to Celsius first
-    if from_unit == "C":
-        celsius = value
-    elif from_unit == "F":
-        celsius = (value - 32) * 5 / 9
-    elif from_unit == "K":
-        celsius = value - 273.15
-    else:
-        return f"Unknown source unit: {from_unit}. Use C, F, or K."
-
-    # Convert from Celsius to target
-    if to_unit == "C":
-        result = celsius
-    elif to_unit == "F":
-        result = celsius * 9 / 5 + 32
-    elif to_unit == "K":
-        result = celsius + 273.15
-    else:
-        return f"Unknown target unit: {to_unit}. Use C, F, or K."
+    try:
+        result = convert_temp(value, from_unit, to_unit)
+    except ValueError as e:
+        return str(e)
 
-    return f"{value}°{from_unit} = {result:.2f}°{to_unit}"
+    return f"{value}°{from_unit.upper()} = {result:.2f}°{to_unit.upper()}"
 
 
 @tool
@@ -231,24 +387,14 @@ def get_city_info(city: str) -> str:
     Args:
         city: The name of the city to get information about.
     """
-    city_data = {
-        "london": {"country": "UK", "population": "8.8 million", "timezone": "GMT"},
-        "paris": {"country": "France", "population": "2.1 million", "timezone": "CET"},
-        "new york": {"country": "USA", "population": "8.3 million", "timezone": "EST"},
-        "tokyo": {"country": "Japan", "population": "13.9 million", "timezone": "JST"},
-        "helsinki": {"country": "Finland", "population": "0.6 million", "timezone": "EET"},
-        "sydney": {"country": "Australia", "population": "5.3 million", "timezone": "AEST"},
-    }
-
-    city_lower = city.lower()
-    if city_lower in city_data:
-        data = city_data[city_lower]
-        return f"{city}: {data['country']}, Population: {data['population']}, Timezone: {data['timezone']}"
+    i = _CITY_INDEX.get(city.lower())
+    if i is not None:
+        return f"{city}: {CITY_COUNTRY[i]}, Population: {CITY_POPULATION[i]}, Timezone: {CITY_TIMEZONE[i]}"
     return f"City information not available for {city}."
 
 
 @tool
-def fetch_webpage(url: str, extract_text: bool = True) -> str:
+async def fetch_webpage(url: str, extract_text: bool = True) -> str:
     """Fetch content from a webpage URL.
 
     Args:
@@ -260,25 +406,11 @@ def fetch_webpage(url: str, extract_text: bool = True) -> str:
         if not url.startswith(("http://", "https://")):
             return "Error: URL must start with http:// or https://"
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; Workshop-Agent/1.0)"
-        }
-
-        response = httpx.get(url, headers=headers, timeout=15.0, follow_redirects=True)
-        response.raise_for_status()
-
-        content = response.text
+        content = await _fetch_html(url, timeout=15.0)
 
         if extract_text:
-            # Simple text extraction - remove HTML tags
-            import re
-            # Remove script and style elements
-            content = re.sub(r'<script[^>]*>.*?</script>', '', content, flags=re.DOTALL | re.IGNORECASE)
-            content = re.sub(r'<style[^>]*>.*?</style>', '', content, flags=re.DOTALL | re.IGNORECASE)
-            # Remove HTML tags
-            content = re.sub(r'<[^>]+>', ' ', content)
-            # Clean up whitespace
-            content = re.sub(r'\s+', ' ', content).strip()
+            # Extract visible text (scripts, styles and tags removed)
+            content = _html_to_text(content)
             # Limit length
             if len(content) > 3000:
                 content = content[:3000] + "... [truncated]"
@@ -294,7 +426,7 @@ def fetch_webpage(url: str, extract_text: bool = True) -> str:
 
 
 @tool
-def get_webpage_title(url: str) -> str:
+async def get_webpage_title(url: str) -> str:
     """Get the title of a webpage.
 
     Args:
@@ -304,20 +436,13 @@ def get_webpage_title(url: str) -> str:
         if not url.startswith(("http://", "https://")):
             return "Error: URL must start with http:// or https://"
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (compatible; Workshop-Agent/1.0)"
-        }
-
-        response = httpx.get(url, headers=headers, timeout=10.0, follow_redirects=True)
-        response.raise_for_status()
-
-        import re
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', response.text, re.IGNORECASE | re.DOTALL)
+        # The <title> lives in <head>, well inside the byte cap
+        title_match = _TITLE_RE.search(await _fetch_html(url, timeout=10.0))
 
         if title_match:
             title = title_match.group(1).strip()
             # Clean up whitespace
-            title = re.sub(r'\s+', ' ', title)
+            title = _WS_RE.sub(' ', title)
             return f"Page title: {title}"
         return f"No title found for {url}"
 
@@ -329,26 +454,7 @@ def get_webpage_title(url: str) -> str:
 # Agent Creation
 # ==============================================================================
 
-def create_agent_with_tools():
-    """Create a Strands agent with all defined tools."""
-    model = AnthropicModel(
-        model_id="claude-haiku-4-5-20251001",
-        max_tokens=1024
-    )
-
-    agent = Agent(
-        model=model,
-        tools=[
-            get_weather,
-            calculate,
-            get_current_time,
-            convert_temperature,
-            generate_random_number,
-            get_city_info,
-            fetch_webpage,
-            get_webpage_title,
-        ],
-        system_prompt="""You are a helpful assistant with access to several tools:
+AGENT_SYSTEM_PROMPT = """You are a helpful assistant with access to several tools:
 - Real-time weather data for major cities (via Open-Meteo API)
 - A calculator for math expressions
 - Current time
@@ -359,24 +465,106 @@ def create_agent_with_tools():
 
 Use tools when they would help answer the user's question.
 When using tool results, incorporate them naturally into your response."""
+
+WEATHER_AGENT_SYSTEM_PROMPT = """You are WeatherBot, a specialized weather assistant.
+You can check weather conditions and convert temperatures.
+Be friendly and provide helpful weather-related advice."""
+
+# Tool lists are fixed tuples so the tool schemas (part of the cached prefix)
+# are sent in the same order on every request
+AGENT_TOOLS = (
+    get_weather,
+    get_weather_batch,
+    calculate,
+    get_current_time,
+    convert_temperature,
+    generate_random_number,
+    get_city_info,
+    fetch_webpage,
+    get_webpage_title,
+)
+# Upper bound on agent calls in flight during the demo query sweep
+MAX_CONCURRENT_QUERIES = 5
+
+WEATHER_AGENT_TOOLS = (get_weather, get_weather_batch, convert_temperature, get_city_info)
+
+
+def create_cached_model(system_prompt: str) -> "AnthropicModel":
+    """Create a model that sends the system prompt as a cached block.
+
+    AnthropicModel merges ``params`` into the request last, so the structured
+    system block below replaces the plain string the Agent would send. The
+    cache breakpoint covers the tool schemas and system prompt, which are
+    billed at the cache-read rate on every call after the first. Prompts
+    shorter than the model's minimum cacheable length are processed uncached.
+
+    Args:
+        system_prompt: Static system prompt text (never interpolate per-request data).
+    """
+    from strands.models.anthropic import AnthropicModel
+
+    return AnthropicModel(
+        model_id="claude-haiku-4-5-20251001",
+        max_tokens=1024,
+        params={
+            "system": [{
+                "type": "text",
+                "text": system_prompt,
+                "cache_control": {"type": "ephemeral"},
+            }],
+        },
+    )
+
+
+def create_agent_with_tools(stream_output: bool = True):
+    """Create a Strands agent with all defined tools.
+
+    Args:
+        stream_output: Print the answer as it streams. Disable this for
+            agents that run concurrently so their output doesn't interleave.
+    """
+    from strands import Agent
+
+    extra = {} if stream_output else {"callback_handler": None}
+    agent = Agent(
+        model=create_cached_model(AGENT_SYSTEM_PROMPT),
+        tools=list(AGENT_TOOLS),
+        system_prompt=AGENT_SYSTEM_PROMPT,
+        **extra
     )
 
     return agent
 
 
+async def run_queries(queries: list) -> list:
+    """Answer independent queries concurrently, each on a fresh agent.
+
+    Agents carry conversation state, so every query gets its own. At most
+    MAX_CONCURRENT_QUERIES run at once to stay within API rate limits.
+
+    Args:
+        queries: The user messages to send.
+
+    Returns:
+        One response (or exception) per query, in input order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    async def _one(query: str):
+        async with semaphore:
+            return await create_agent_with_tools(stream_output=False).invoke_async(query)
+
+    return await asyncio.gather(*(_one(query) for query in queries), return_exceptions=True)
+
+
 def create_weather_agent():
     """Create a specialized weather-focused agent."""
-    model = AnthropicModel(
-        model_id="claude-haiku-4-5-20251001",
-        max_tokens=1024
-    )
+    from strands import Agent
 
     agent = Agent(
-        model=model,
-        tools=[get_weather, convert_temperature, get_city_info],
-        system_prompt="""You are WeatherBot, a specialized weather assistant.
-You can check weather conditions and convert temperatures.
-Be friendly and provide helpful weather-related advice."""
+        model=create_cached_model(WEATHER_AGENT_SYSTEM_PROMPT),
+        tools=list(WEATHER_AGENT_TOOLS),
+        system_prompt=WEATHER_AGENT_SYSTEM_PROMPT
     )
 
     return agent
@@ -406,15 +594,17 @@ def main():
         ("7. Multi-step Query", "What's the weather in London and Helsinki? Which is colder?"),
     ]
 
-    for title, query in test_queries:
+    # The queries are independent, so run them concurrently and print in order
+    responses = asyncio.run(run_queries([query for _, query in test_queries]))
+
+    for (title, query), response in zip(test_queries, responses):
         print(Colors.header(f"\n{title}"))
         print("-" * 40)
         print(Colors.prompt(f"User: {query}"))
-        try:
-            response = agent(query)
+        if isinstance(response, Exception):
+            print(f"Error: {response}")
+        else:
             print(Colors.response(f"Agent: {response}"))
-        except Exception as e:
-            print(f"Error: {e}")
 
     # Demo the specialized weather agent
     print(Colors.header("\n" + "=" * 70))
@@ -458,8 +648,10 @@ def web_demo():
 
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) > 1 and sys.argv[1] == "web":
-        web_demo()
-    else:
-        main()
+    try:
+        if len(sys.argv) > 1 and sys.argv[1] == "web":
+            web_demo()
+        else:
+            main()
+    finally:
+        close_http_client()
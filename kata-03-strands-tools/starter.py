@@ -10,7 +10,9 @@ Prerequisites:
 """
 
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 from dotenv import load_dotenv
 # TODO 1: Import required modules
 # from strands import Agent, tool
@@ -19,36 +21,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-
-# ANSI color codes for terminal output
-class Colors:
-    HEADER = '\033[96m'
-    PROMPT = '\033[93m'
-    RESPONSE = '\033[92m'
-    STATS = '\033[95m'
-    TODO = '\033[91m'
-    BOLD = '\033[1m'
-    RESET = '\033[0m'
-
-    @classmethod
-    def header(cls, text):
-        return f"{cls.BOLD}{cls.HEADER}{text}{cls.RESET}"
-
-    @classmethod
-    def prompt(cls, text):
-        return f"{cls.PROMPT}{text}{cls.RESET}"
-
-    @classmethod
-    def response(cls, text):
-        return f"{cls.RESPONSE}{text}{cls.RESET}"
-
-    @classmethod
-    def stats(cls, text):
-        return f"{cls.STATS}{text}{cls.RESET}"
-
-    @classmethod
-    def todo(cls, text):
-        return f"{cls.TODO}{text}{cls.RESET}"
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.colors import Colors  # noqa: E402
 
 
 # City coordinates for weather lookup
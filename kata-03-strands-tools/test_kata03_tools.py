@@ -0,0 +1,42 @@
+"""
+Unit tests for the Kata 03 tools that need no network
+
+Run with: pytest test_kata03_tools.py -v
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# Make the shared workshop package importable when running from the kata directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.testing import load_kata_module  # noqa: E402
+
+pytest.importorskip("strands")
+pytest.importorskip("httpx")
+pytest.importorskip("dotenv")
+
+solution = load_kata_module(__file__)
+
+
+class TestCalculate:
+    """Tests for the calculate tool."""
+
+    def test_basic_expression(self):
+        assert solution.calculate("2 + 3 * 4") == "Result: 14"
+
+    def test_division_by_zero(self):
+        assert solution.calculate("1 / 0") == "Error: Division by zero"
+
+    @pytest.mark.parametrize("expression", [
+        "9 ** 10 ** 9",
+        "pow(9, 10 ** 9)",
+        "((9 ** 999) ** 999) ** 999",
+        "(1,) * 10 ** 9",
+        "round(5, -10 ** 9)",
+    ])
+    def test_oversized_expressions_are_refused(self, expression):
+        assert solution.calculate(expression).startswith("Error calculating")
+
+    def test_code_is_not_executed(self):
+        assert solution.calculate("__import__('os').system('true')").startswith("Error")
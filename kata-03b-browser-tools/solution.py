@@ -5,17 +5,23 @@ This script demonstrates how to create browser automation tools using
 Playwright and integrate them with Strands agents.
 
 Prerequisites:
-    pip install 'strands-agents[anthropic]' playwright
+    pip install 'strands-agents[anthropic]' playwright 'httpx[http2]'
     playwright install chromium
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
 import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache, wraps
 from pathlib import Path
+import httpx
 from dotenv import load_dotenv
 from strands import Agent, tool
 from strands.models.anthropic import AnthropicModel
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 
 load_dotenv()
 
@@ -50,12 +56,234 @@ class Colors:
         return f"{cls.STATS}{text}{cls.RESET}"
 
 
+# ==============================================================================
+# Shared Browser
+# ==============================================================================
+
+# Launching Chromium costs 0.5-2s, so one browser is started on first use and
+# reused by every tool (each call still gets its own isolated context).
+# Playwright objects are bound to the event loop that created them, while each
+# agent invocation may run on its own loop, so the browser lives on a
+# dedicated background loop. Tools are async and hand their page work to that
+# loop, so parallel tool calls overlap their network waits.
+_BROWSER_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_BROWSER_LOOP.run_forever, name="playwright", daemon=True).start()
+_BROWSER_LOCK = asyncio.Lock()
+_playwright = None
+_browser = None
+
+# Headless-only flags: skip GPU/extension/background work and use /tmp instead
+# of a small /dev/shm (containers). The sandbox stays on, since the agent
+# visits arbitrary URLs.
+CHROMIUM_ARGS = (
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+)
+
+# Subresources the text/DOM tools never look at. Stylesheets still load:
+# innerText depends on CSS (display:none, generated content).
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+
+
+async def _get_browser():
+    """Return the shared browser, launching it on first use (browser loop only)."""
+    global _playwright, _browser
+    async with _BROWSER_LOCK:
+        if _browser is None:
+            _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=list(CHROMIUM_ARGS))
+    return _browser
+
+
+async def _block_heavy_resources(route):
+    """Abort requests for images, media and fonts; let the rest through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _run_in_browser(fn, block_resources: bool = False, **context_options):
+    """Await fn(page) on a fresh page in the shared browser and return its result.
+
+    Args:
+        fn: Async callable taking a Playwright Page.
+        block_resources: Skip BLOCKED_RESOURCE_TYPES, for tools that only read the DOM.
+        context_options: Passed to browser.new_context() (e.g. viewport).
+    """
+    async def _task():
+        browser = await _get_browser()
+        context = await browser.new_context(**context_options)
+        if block_resources:
+            await context.route("**/*", _block_heavy_resources)
+        try:
+            return await fn(await context.new_page())
+        finally:
+            await context.close()
+
+    future = asyncio.run_coroutine_threadsafe(_task(), _BROWSER_LOOP)
+    return await asyncio.wrap_future(future)
+
+
+def warm_up_browser():
+    """Launch the shared browser and open/close one context ahead of time.
+
+    Keeps Chromium's startup out of the first tool call, so per-query
+    timings reflect steady-state latency.
+    """
+    async def _warm():
+        browser = await _get_browser()
+        context = await browser.new_context()
+        await context.close()
+
+    asyncio.run_coroutine_threadsafe(_warm(), _BROWSER_LOOP).result()
+
+
+def close_browser():
+    """Close the shared browser and stop Playwright."""
+    async def _close():
+        global _playwright, _browser
+        if _browser is not None:
+            await _browser.close()
+            await _playwright.stop()
+            _playwright = _browser = None
+
+    asyncio.run_coroutine_threadsafe(_close(), _BROWSER_LOOP).result()
+
+
+# ==============================================================================
+# Page Snapshot Cache
+# ==============================================================================
+
+# Agents often run several tools against the same URL in one task (status,
+# metadata, headings...). One visit collects everything those tools need and
+# is kept briefly, so follow-up tools skip the navigation entirely.
+PAGE_CACHE_TTL = 300.0
+PAGE_CACHE_SIZE = 64
+_PAGE_CACHE: "OrderedDict[tuple[str, bool], tuple[float, dict]]" = OrderedDict()
+_PAGE_CACHE_LOCK = threading.Lock()
+
+# Upper bound on waiting for network quiet after the load event
+NETWORK_IDLE_GRACE_MS = 3000
+
+# Characters of page text get_page_content returns
+PAGE_TEXT_LIMIT = 3000
+
+# Links extract_links lists
+LINK_LIMIT = 20
+
+
+# Everything the read-only tools need, gathered in one evaluate() round trip.
+# The page's HTML never crosses CDP: body text is whitespace-collapsed and cut
+# to maxText + 1 characters (the extra one tells whether it was cut), links
+# stop after maxLinks + 1, and headings and meta tags are short. The result
+# is a few KB however large the page is.
+_EXTRACT_ALL_JS = """({maxText, maxLinks}) => {
+    const meta = sel => document.querySelector(sel)?.content || null;
+    const clean = s => s.replace(/\\s+/g, " ").trim();
+    const text = document.body ? document.body.innerText : "";
+    const links = [];
+    for (const a of document.querySelectorAll("a[href]")) {
+        const linkText = clean(a.textContent);
+        if (linkText) links.push({text: linkText, href: a.href});
+        if (links.length > maxLinks) break;
+    }
+    return {
+        url: location.href,
+        title: document.title,
+        text: clean(text).slice(0, maxText + 1),
+        links,
+        headings: Array.from(
+            document.querySelectorAll("h1, h2, h3, h4, h5, h6"),
+            h => ({level: h.tagName, text: clean(h.textContent)}),
+        ),
+        meta: {
+            description: meta("meta[name='description']"),
+            keywords: meta("meta[name='keywords']"),
+            og_title: meta("meta[property='og:title']"),
+            og_description: meta("meta[property='og:description']"),
+        },
+    };
+}"""
+
+
+async def _goto(page, url: str, settle: bool = False):
+    """Navigate to url and return the response.
+
+    Text, links and metadata are in the DOM at DOMContentLoaded, so that is
+    the default. With settle=True the page is given until the load event and
+    then at most NETWORK_IDLE_GRACE_MS of extra time for late JS/network
+    work; plain "networkidle" can add 5-30s on pages with analytics beacons.
+    """
+    if not settle:
+        return await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+
+    response = await page.goto(url, wait_until="load", timeout=30000)
+    try:
+        await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_GRACE_MS)
+    except PlaywrightTimeout:
+        pass
+    return response
+
+
+async def _snapshot_page(page, url: str, settle: bool) -> dict:
+    """Visit url once and collect everything the read-only tools report."""
+    await _goto(page, url, settle)
+    return await page.evaluate(
+        _EXTRACT_ALL_JS, {"maxText": PAGE_TEXT_LIMIT, "maxLinks": LINK_LIMIT}
+    )
+
+
+async def _fetch_page(url: str, settle: bool = False) -> dict:
+    """Return a page snapshot for url, from cache when it is fresh.
+
+    Args:
+        url: The page to load.
+        settle: Let JavaScript finish rendering first (see _goto); part of the cache key.
+    """
+    key = (url, settle)
+    with _PAGE_CACHE_LOCK:
+        hit = _PAGE_CACHE.get(key)
+        if hit is not None and time.monotonic() - hit[0] < PAGE_CACHE_TTL:
+            _PAGE_CACHE.move_to_end(key)
+            return hit[1]
+
+    snapshot = await _run_in_browser(
+        lambda page: _snapshot_page(page, url, settle), block_resources=True
+    )
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[key] = (time.monotonic(), snapshot)
+        if len(_PAGE_CACHE) > PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+    return snapshot
+
+
 # ==============================================================================
 # Browser Tools
 # ==============================================================================
 
+_VALID_SCHEMES = ("http://", "https://")
+_BAD_URL_MSG = "Error: URL must start with http:// or https://"
+
+
+def _require_http(fn):
+    """Make a tool return _BAD_URL_MSG instead of running on a non-http(s) URL.
+
+    functools.wraps keeps the signature and docstring @tool builds the schema from.
+    """
+    @wraps(fn)
+    async def wrapper(url: str, *args, **kwargs):
+        if not url.startswith(_VALID_SCHEMES):
+            return _BAD_URL_MSG
+        return await fn(url, *args, **kwargs)
+    return wrapper
+
+
 @tool
-def take_screenshot(url: str, filename: str = "screenshot.png", full_page: bool = True) -> str:
+@_require_http
+async def take_screenshot(url: str, filename: str = "screenshot.png", full_page: bool = True) -> str:
     """Take a screenshot of a webpage.
 
     Args:
@@ -63,20 +291,14 @@ def take_screenshot(url: str, filename: str = "screenshot.png", full_page: bool
         filename: Output filename (saved in screenshots/ directory).
         full_page: If True, capture the full scrollable page.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
     filepath = SCREENSHOTS_DIR / filename
 
-    try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(viewport={"width": 1280, "height": 720})
+    async def _visit(page):
+        await _goto(page, url, settle=True)
+        await page.screenshot(path=str(filepath), full_page=full_page)
 
-            page.goto(url, wait_until="networkidle", timeout=30000)
-            page.screenshot(path=str(filepath), full_page=full_page)
-
-            browser.close()
+    try:
+        await _run_in_browser(_visit, viewport={"width": 1280, "height": 720})
 
         return f"Screenshot saved to {filepath}"
 
@@ -87,38 +309,21 @@ def take_screenshot(url: str, filename: str = "screenshot.png", full_page: bool
 
 
 @tool
-def get_page_content(url: str, wait_for_js: bool = True) -> str:
+@_require_http
+async def get_page_content(url: str, wait_for_js: bool = True) -> str:
     """Get the rendered content of a webpage, including JavaScript-rendered content.
 
     Args:
         url: The URL to fetch content from.
         wait_for_js: If True, wait for JavaScript to finish rendering.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
+        snapshot = await _fetch_page(url, settle=wait_for_js)
+        title, content = snapshot["title"], snapshot["text"]
 
-            wait_until = "networkidle" if wait_for_js else "domcontentloaded"
-            page.goto(url, wait_until=wait_until, timeout=30000)
-
-            # Get page title
-            title = page.title()
-
-            # Get text content
-            content = page.inner_text("body")
-
-            # Clean up whitespace
-            content = " ".join(content.split())
-
-            # Limit length
-            if len(content) > 3000:
-                content = content[:3000] + "... [truncated]"
-
-            browser.close()
+        # Already whitespace-normalized and capped in the browser
+        if len(content) > PAGE_TEXT_LIMIT:
+            content = content[:PAGE_TEXT_LIMIT] + "... [truncated]"
 
         return f"Title: {title}\n\nContent:\n{content}"
 
@@ -129,128 +334,70 @@ def get_page_content(url: str, wait_for_js: bool = True) -> str:
 
 
 @tool
-def extract_links(url: str) -> str:
+@_require_http
+async def extract_links(url: str) -> str:
     """Extract all links from a webpage.
 
     Args:
         url: The URL to extract links from.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            # Extract all links
-            links = page.eval_on_selector_all(
-                "a[href]",
-                "elements => elements.map(e => ({text: e.innerText.trim(), href: e.href})).filter(l => l.href && l.text)"
-            )
-
-            browser.close()
+        links = (await _fetch_page(url))["links"]
 
         if not links:
             return f"No links found on {url}"
 
-        # Format links (limit to first 20)
-        links = links[:20]
-        result = f"Links found on {url}:\n\n"
-        for link in links:
-            text = link["text"][:50] + "..." if len(link["text"]) > 50 else link["text"]
-            result += f"- {text}: {link['href']}\n"
+        # Format links (the page sends one past the limit, to flag a cut list)
+        lines = [
+            f"- {link['text'][:50] + '...' if len(link['text']) > 50 else link['text']}: {link['href']}\n"
+            for link in links[:LINK_LIMIT]
+        ]
+        if len(links) > LINK_LIMIT:
+            lines.append(f"\n... (showing first {LINK_LIMIT} links)")
 
-        if len(links) == 20:
-            result += "\n... (showing first 20 links)"
-
-        return result
+        return f"Links found on {url}:\n\n" + "".join(lines)
 
     except Exception as e:
         return f"Error extracting links: {str(e)}"
 
 
 @tool
-def extract_headings(url: str) -> str:
+@_require_http
+async def extract_headings(url: str) -> str:
     """Extract all headings (h1-h6) from a webpage.
 
     Args:
         url: The URL to extract headings from.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            # Extract headings
-            headings = page.eval_on_selector_all(
-                "h1, h2, h3, h4, h5, h6",
-                "elements => elements.map(e => ({level: e.tagName, text: e.innerText.trim()}))"
-            )
-
-            browser.close()
+        headings = (await _fetch_page(url))["headings"]
 
         if not headings:
             return f"No headings found on {url}"
 
-        result = f"Headings on {url}:\n\n"
-        for h in headings:
-            result += f"[{h['level']}] {h['text']}\n"
-
-        return result
+        return f"Headings on {url}:\n\n" + "".join(
+            f"[{h['level']}] {h['text']}\n" for h in headings
+        )
 
     except Exception as e:
         return f"Error extracting headings: {str(e)}"
 
 
 @tool
-def get_page_metadata(url: str) -> str:
+@_require_http
+async def get_page_metadata(url: str) -> str:
     """Get metadata from a webpage (title, description, keywords, etc.).
 
     Args:
         url: The URL to get metadata from.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-            # Extract metadata
-            title = page.title()
-
-            meta_desc = page.eval_on_selector(
-                "meta[name='description']",
-                "el => el ? el.content : null"
-            ) if page.query_selector("meta[name='description']") else None
-
-            meta_keywords = page.eval_on_selector(
-                "meta[name='keywords']",
-                "el => el ? el.content : null"
-            ) if page.query_selector("meta[name='keywords']") else None
-
-            og_title = page.eval_on_selector(
-                "meta[property='og:title']",
-                "el => el ? el.content : null"
-            ) if page.query_selector("meta[property='og:title']") else None
-
-            og_desc = page.eval_on_selector(
-                "meta[property='og:description']",
-                "el => el ? el.content : null"
-            ) if page.query_selector("meta[property='og:description']") else None
-
-            browser.close()
+        snapshot = await _fetch_page(url)
+        title, meta = snapshot["title"], snapshot["meta"]
+        meta_desc = meta.get("description")
+        meta_keywords = meta.get("keywords")
+        og_title = meta.get("og_title")
+        og_desc = meta.get("og_description")
 
         result = f"Metadata for {url}:\n\n"
         result += f"Title: {title}\n"
@@ -270,34 +417,28 @@ def get_page_metadata(url: str) -> str:
 
 
 @tool
-def check_page_status(url: str) -> str:
+@_require_http
+async def check_page_status(url: str) -> str:
     """Check if a webpage is accessible and get its status.
 
     Args:
         url: The URL to check.
     """
-    if not url.startswith(("http://", "https://")):
-        return "Error: URL must start with http:// or https://"
-
+    # Reachability is an HTTP question, so this skips the browser entirely
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-
-            response = page.goto(url, timeout=30000)
-
-            status = response.status if response else "Unknown"
-            ok = response.ok if response else False
-
-            # Get page load timing
-            timing = page.evaluate("() => performance.timing.loadEventEnd - performance.timing.navigationStart")
-
-            browser.close()
-
-        status_text = "accessible" if ok else "not accessible"
-        return f"URL: {url}\nStatus: {status} ({status_text})\nLoad time: {timing}ms"
-
-    except PlaywrightTimeout:
+        async with httpx.AsyncClient(http2=True, follow_redirects=True, timeout=10.0) as client:
+            start = time.perf_counter()
+            response = await client.head(url)
+            if response.status_code in (405, 501):
+                # Some servers refuse HEAD; fall back to GET without reading the body
+                async with client.stream("GET", url) as response:
+                    pass
+            timing = round((time.perf_counter() - start) * 1000)
+
+        status_text = "accessible" if response.is_success else "not accessible"
+        return f"URL: {url}\nStatus: {response.status_code} ({status_text})\nResponse time: {timing}ms"
+
+    except httpx.TimeoutException:
         return f"URL: {url}\nStatus: Timeout - page took too long to load"
     except Exception as e:
         return f"URL: {url}\nStatus: Error - {str(e)}"
@@ -307,15 +448,45 @@ def check_page_status(url: str) -> str:
 # Agent Creation
 # ==============================================================================
 
-def create_browser_agent():
-    """Create a Strands agent with browser automation tools."""
-    model = AnthropicModel(
+BROWSER_SYSTEM_PROMPT = """You are a web research assistant with browser automation capabilities.
+
+You can:
+- Take screenshots of web pages
+- Extract content from JavaScript-rendered pages
+- Get links and headings from pages
+- Check page metadata and status
+
+Use these tools to help users research and gather information from the web.
+When using tool results, summarize the key findings clearly."""
+
+
+@lru_cache(maxsize=1)
+def get_browser_model():
+    """
+    Return the shared model, so every agent reuses one API client.
+
+    The system prompt is sent as a cached block: AnthropicModel merges
+    ``params`` into the request last, so it replaces the plain string the
+    Agent would send. Each tool-call turn after the first reads the tool
+    schemas and system prompt from the cache instead of reprocessing them.
+    """
+    return AnthropicModel(
         model_id="claude-sonnet-4-20250514",
-        max_tokens=1024
+        max_tokens=1024,
+        params={
+            "system": [{
+                "type": "text",
+                "text": BROWSER_SYSTEM_PROMPT,
+                "cache_control": {"type": "ephemeral"},
+            }],
+        },
     )
 
+
+def create_browser_agent():
+    """Create a Strands agent with browser automation tools."""
     agent = Agent(
-        model=model,
+        model=get_browser_model(),
         tools=[
             take_screenshot,
             get_page_content,
@@ -324,16 +495,7 @@ def create_browser_agent():
             get_page_metadata,
             check_page_status,
         ],
-        system_prompt="""You are a web research assistant with browser automation capabilities.
-
-You can:
-- Take screenshots of web pages
-- Extract content from JavaScript-rendered pages
-- Get links and headings from pages
-- Check page metadata and status
-
-Use these tools to help users research and gather information from the web.
-When using tool results, summarize the key findings clearly."""
+        system_prompt=BROWSER_SYSTEM_PROMPT
     )
 
     return agent
@@ -349,6 +511,9 @@ def main():
     print(Colors.header(" Kata 03b: Browser Automation Tools - Solution"))
     print(Colors.header("=" * 70))
 
+    # Start Chromium now rather than inside the first query
+    warm_up_browser()
+
     # Create the browser agent
     agent = create_browser_agent()
 
@@ -398,6 +563,7 @@ def test_url(url: str):
     print(Colors.header(f" Testing: {url}"))
     print(Colors.header("=" * 70))
 
+    warm_up_browser()
     agent = create_browser_agent()
 
     queries = [
@@ -420,8 +586,11 @@ def test_url(url: str):
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) > 1:
-        # Custom URL provided
-        test_url(sys.argv[1])
-    else:
-        main()
+    try:
+        if len(sys.argv) > 1:
+            # Custom URL provided
+            test_url(sys.argv[1])
+        else:
+            main()
+    finally:
+        close_browser()
@@ -5,23 +5,94 @@ This script demonstrates how to implement RAG (Retrieval-Augmented Generation)
 programmatically using LlamaIndex with local embeddings and Claude.
 
 Prerequisites:
-    pip install llama-index llama-index-llms-anthropic llama-index-embeddings-huggingface chromadb
+    pip install llama-index llama-index-llms-anthropic llama-index-embeddings-huggingface
+    pip install chromadb llama-index-vector-stores-chroma
+    pip install 'optimum[onnxruntime]'  # optional, int8 ONNX embeddings on CPU
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
+import hashlib
+import json
 import os
+import sys
+import time
+from functools import lru_cache
 from pathlib import Path
+import chromadb
 from dotenv import load_dotenv
 from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, Settings
+from llama_index.core.ingestion import run_transformations
+from llama_index.core.node_parser import SentenceSplitter
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.llms.anthropic import Anthropic
+from llama_index.vector_stores.chroma import ChromaVectorStore
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.embeddings import (  # noqa: E402
+    EMBED_MODEL_NAME,
+    MAX_SEQ_LENGTH,
+    ORT_AVAILABLE,
+    OnnxEmbedding,
+    configure_cpu_threads,
+    embedding_backend,
+    export_quantized_model,
+    pick_device,
+    sort_for_embedding,
+)
+
 # Path to sample documents
 DOCS_PATH = Path(__file__).parent / "sample_data" / "weather_docs"
 
+# Chroma keeps the embeddings on disk so later runs skip re-embedding
+CHROMA_DIR = Path(__file__).parent / ".chroma"
+CHROMA_COLLECTION = "weather_docs"
+
+# Chroma's HNSW index settings; embeddings are unit-length, so cosine fits
+CHROMA_HNSW = {"hnsw:space": "cosine", "hnsw:construction_ef": 200, "hnsw:M": 16}
+
+# Sidecar listing which document hashes are already in the collection
+MANIFEST_FILE = "indexed_docs.json"
+
+# Concurrent LLM calls allowed when answering a batch of questions
+MAX_CONCURRENT_QUERIES = 5
+
+RAG_MODEL = "claude-haiku-4-5-20251001"
+
+# Connection pool for the shared Anthropic client
+ANTHROPIC_MAX_CONNECTIONS = 64
+ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS = 32
+
+# Seconds between status checks while a Message Batch is processing
+BATCH_POLL_INTERVAL = 10.0
 
+# Same shape as LlamaIndex's default question-answering prompt
+QA_PROMPT = (
+    "Context information is below.\n"
+    "---------------------\n"
+    "{context}\n"
+    "---------------------\n"
+    "Given the context information and not prior knowledge, answer the query.\n"
+    "Query: {question}\n"
+    "Answer: "
+)
+
+# Chunks embedded per forward pass (LlamaIndex defaults to 10)
+EMBED_BATCH_SIZE = 128
+
+# Folders with more files than this are read and parsed by a process pool;
+# below it, starting the workers costs more than it saves
+PARALLEL_LOAD_MIN_FILES = 32
+
+# MiniLM truncates input past MAX_SEQ_LENGTH word pieces, so chunks are sized to fit
+CHUNK_SIZE = MAX_SEQ_LENGTH
+CHUNK_OVERLAP = 32
+
+
+@lru_cache(maxsize=1)
 def create_embedding_model():
     """
     Create a local embedding model using HuggingFace.
@@ -31,13 +102,50 @@ def create_embedding_model():
     - Good quality embeddings
     - Runs locally (no API costs)
     - 384 dimensions
+
+    The model is loaded once per process and shared; the weights themselves
+    are downloaded once into the HuggingFace cache (~/.cache/huggingface).
+    Chunks are embedded in large batches on the GPU when there is one.
+    On CPU, an int8 ONNX build is used instead if optimum is installed.
     """
+    configure_cpu_threads()
+    device = pick_device()
+    if device == "cpu" and ORT_AVAILABLE:
+        return OnnxEmbedding(
+            export_quantized_model(), embed_batch_size=EMBED_BATCH_SIZE
+        )
+
     embed_model = HuggingFaceEmbedding(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
+        model_name=EMBED_MODEL_NAME,
+        embed_batch_size=EMBED_BATCH_SIZE,
+        device=device,
     )
+
+    # fp16 halves memory traffic on CUDA; MiniLM embeddings are unaffected
+    if device == "cuda":
+        embed_model._model.half()
+
     return embed_model
 
 
+@lru_cache(maxsize=1)
+def create_node_parser():
+    """
+    Create a splitter that measures chunks in MiniLM's own tokens.
+
+    The default splitter counts tokens with a GPT tokenizer, so its chunks
+    can run past what the embedding model reads and get silently cut off.
+    """
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(EMBED_MODEL_NAME, use_fast=True)
+    return SentenceSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
+        tokenizer=tokenizer.encode,
+    )
+
+
 def load_documents(docs_path: Path):
     """
     Load documents from a directory.
@@ -46,19 +154,28 @@ def load_documents(docs_path: Path):
     - Multiple file formats (MD, TXT, PDF, etc.)
     - Recursive directory scanning
     - Document metadata extraction
+
+    Each document's id is a hash of its path and content, so an unchanged
+    file gets the same id on every run and can be skipped when indexing.
     """
     if not docs_path.exists():
         raise FileNotFoundError(f"Documents directory not found: {docs_path}")
 
-    documents = SimpleDirectoryReader(
+    reader = SimpleDirectoryReader(
         str(docs_path),
         recursive=True  # Include subdirectories
-    ).load_data()
+    )
+    parallel = len(reader.input_files) > PARALLEL_LOAD_MIN_FILES
+    documents = reader.load_data(num_workers=os.cpu_count() if parallel else None)
+
+    for doc in documents:
+        key = doc.metadata.get("file_path", "") + "\0" + doc.text
+        doc.doc_id = hashlib.sha256(key.encode()).hexdigest()
 
     return documents
 
 
-def create_index(documents, embed_model):
+def create_index(documents, embed_model, persist_dir: Path = CHROMA_DIR):
     """
     Create a vector index from documents.
 
@@ -66,18 +183,108 @@ def create_index(documents, embed_model):
     - Splits documents into chunks
     - Converts chunks to embeddings
     - Stores embeddings for fast retrieval
+
+    Embeddings live in a persistent Chroma collection under persist_dir.
+    A manifest next to it records which document ids (content hashes) are
+    indexed, so each run only embeds new or edited documents and drops
+    deleted ones. The manifest also records the embedding build and the
+    chunking settings; if either changes, the collection is rebuilt rather
+    than mixing incompatible vectors. Delete the directory to rebuild from
+    scratch.
     """
     # Configure settings
     Settings.embed_model = embed_model
+    Settings.node_parser = create_node_parser()
+
+    client = chromadb.PersistentClient(path=str(persist_dir))
+    manifest_path = persist_dir / MANIFEST_FILE
+    settings = {
+        "embed_backend": embedding_backend(embed_model),
+        "model": EMBED_MODEL_NAME,
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+    }
+
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    if manifest.get("settings") == settings:
+        indexed = manifest["docs"]
+    else:
+        # No manifest, or one written with other settings: the collection
+        # can't be diffed or its vectors don't match, so start it over
+        client.get_or_create_collection(CHROMA_COLLECTION)
+        client.delete_collection(CHROMA_COLLECTION)
+        indexed = {}
+    collection = client.get_or_create_collection(CHROMA_COLLECTION, metadata=CHROMA_HNSW)
+    vector_store = ChromaVectorStore(chroma_collection=collection)
+    index = VectorStoreIndex.from_vector_store(vector_store, embed_model=embed_model)
+
+    def save_manifest():
+        manifest_path.write_text(json.dumps({"settings": settings, "docs": indexed}, indent=2))
+
+    current = {doc.doc_id: doc for doc in documents}
+
+    # Documents that were edited or removed since the last run
+    for doc_id in indexed.keys() - current.keys():
+        index.delete_ref_doc(doc_id, delete_from_docstore=True)
+        del indexed[doc_id]
+        save_manifest()
+
+    # Chunk and embed only what isn't stored yet
+    new_docs = [doc for doc_id, doc in current.items() if doc_id not in indexed]
+    if new_docs:
+        nodes = run_transformations(
+            new_docs,
+            Settings.transformations,
+            show_progress=True  # Show progress bar during indexing
+        )
+        # Clear chunks a crashed run may have stored before recording them
+        for doc in new_docs:
+            index.delete_ref_doc(doc.doc_id, delete_from_docstore=True)
+
+        # One length-sorted insert for every new chunk, so embedding batches
+        # span documents; the documents are recorded only once it succeeds
+        index.insert_nodes(sort_for_embedding(nodes))
+        for doc in new_docs:
+            indexed[doc.doc_id] = doc.metadata.get("file_name", "")
+
+    save_manifest()
+    return index
 
-    # Create the index
-    index = VectorStoreIndex.from_documents(
-        documents,
-        embed_model=embed_model,
-        show_progress=True  # Show progress bar during indexing
+
+@lru_cache(maxsize=1)
+def get_client():
+    """
+    Return the shared Anthropic client for direct API calls.
+
+    One HTTP/2 connection pool serves every direct call (run_eval_batch),
+    so requests reuse an open TLS session instead of handshaking each
+    time. The query engines don't go through it; see get_llm().
+    """
+    import anthropic
+    import httpx
+
+    http_client = httpx.Client(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=ANTHROPIC_MAX_CONNECTIONS,
+            max_keepalive_connections=ANTHROPIC_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+        timeout=httpx.Timeout(120.0),
     )
+    return anthropic.Anthropic(http_client=http_client)
 
-    return index
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """
+    Return the shared Claude LLM used by every query engine.
+
+    LlamaIndex's Anthropic LLM builds its own API clients and takes no
+    external httpx client, so it can't use get_client()'s pool. Caching
+    the LLM keeps those clients, and their connections, shared by every
+    query engine instead.
+    """
+    return Anthropic(model=RAG_MODEL)
 
 
 def create_query_engine(index, llm=None):
@@ -90,11 +297,12 @@ def create_query_engine(index, llm=None):
     - Returns the generated answer
     """
     if llm is None:
-        llm = Anthropic(model="claude-haiku-4-5-20251001")
+        llm = get_llm()
 
     query_engine = index.as_query_engine(
         llm=llm,
         similarity_top_k=3,  # Number of chunks to retrieve
+        use_async=True,
     )
 
     return query_engine
@@ -112,6 +320,71 @@ def query_documents(query_engine, question: str):
     return response
 
 
+async def query_documents_batch(query_engine, questions: list) -> list:
+    """
+    Answer independent questions concurrently.
+
+    At most MAX_CONCURRENT_QUERIES requests are in flight at once to stay
+    within API rate limits.
+
+    Returns one response (or exception) per question, in input order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    async def _one(question: str):
+        async with semaphore:
+            return await query_engine.aquery(question)
+
+    return await asyncio.gather(*(_one(q) for q in questions), return_exceptions=True)
+
+
+def run_eval_batch(index, questions: list, client=None) -> list:
+    """
+    Answer a fixed question set through the Message Batches API.
+
+    Retrieval runs locally as usual; only the generation calls are
+    submitted as one batch, which costs half as much and isn't subject
+    to the per-minute rate limits. Batches can take minutes, so this is
+    for offline evaluation runs (BATCH=1 python solution.py).
+
+    Returns one answer string per question, in input order.
+    """
+    client = client or get_client()
+    retriever = index.as_retriever(similarity_top_k=3)
+
+    requests = []
+    for i, question in enumerate(questions):
+        context = "\n\n".join(n.node.get_content() for n in retriever.retrieve(question))
+        requests.append({
+            "custom_id": f"q{i}",
+            "params": {
+                "model": RAG_MODEL,
+                "max_tokens": 1024,
+                "messages": [{
+                    "role": "user",
+                    "content": QA_PROMPT.format(context=context, question=question),
+                }],
+            },
+        })
+
+    batch = client.messages.batches.create(requests=requests)
+    while batch.processing_status != "ended":
+        time.sleep(BATCH_POLL_INTERVAL)
+        batch = client.messages.batches.retrieve(batch.id)
+
+    answers = {}
+    for entry in client.messages.batches.results(batch.id):
+        if entry.result.type == "succeeded":
+            answers[entry.custom_id] = "".join(
+                block.text for block in entry.result.message.content if block.type == "text"
+            )
+        else:
+            answers[entry.custom_id] = f"Error: batch request {entry.result.type}"
+
+    # Batch results arrive in any order
+    return [answers[f"q{i}"] for i in range(len(questions))]
+
+
 def print_response_with_sources(response):
     """Print the response along with source information."""
     print(f"Answer: {response.response}\n")
@@ -157,7 +430,9 @@ def main():
     # Step 1: Create embedding model
     print("\n1. Creating embedding model...")
     embed_model = create_embedding_model()
-    print("   Embedding model: sentence-transformers/all-MiniLM-L6-v2")
+    embed_model.get_text_embedding("warmup")  # first call pays one-time init
+    print(f"   Embedding model: {EMBED_MODEL_NAME}")
+    print(f"   Device: {pick_device()} ({type(embed_model).__name__})")
 
     # Step 2: Load documents
     print("\n2. Loading documents...")
@@ -192,11 +467,25 @@ def main():
         "What's the difference between a watch and a warning?",
     ]
 
-    for question in test_questions:
+    if os.environ.get("BATCH") == "1":
+        # Offline eval: half-price Message Batch, answers only
+        print("\nSubmitting questions as a Message Batch (this can take a few minutes)...")
+        for question, answer in zip(test_questions, run_eval_batch(index, test_questions)):
+            print(f"\nQ: {question}")
+            print("-" * 40)
+            print(f"Answer: {answer}")
+        return
+
+    # The questions are independent, so ask them concurrently and print in order
+    responses = asyncio.run(query_documents_batch(query_engine, test_questions))
+
+    for question, response in zip(test_questions, responses):
         print(f"\nQ: {question}")
         print("-" * 40)
-        response = query_documents(query_engine, question)
-        print_response_with_sources(response)
+        if isinstance(response, Exception):
+            print(f"Error: {response}")
+        else:
+            print_response_with_sources(response)
 
     # Step 6: Interactive mode (optional)
     print("\n" + "=" * 70)
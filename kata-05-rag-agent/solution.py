@@ -6,55 +6,377 @@ weather assistant that can search a knowledge base and use other tools.
 
 Prerequisites:
     pip install 'strands-agents[anthropic]' llama-index llama-index-embeddings-huggingface
+    pip install chromadb llama-index-vector-stores-chroma
+    pip install 'optimum[onnxruntime]'  # optional, int8 ONNX embeddings on CPU
+    pip install intel-extension-for-pytorch  # optional, bfloat16 embeddings on CPU
     export ANTHROPIC_API_KEY="your-key-here"
 """
 
+import asyncio
+import atexit
+import hashlib
 import os
+import queue
+import shelve
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from functools import lru_cache
 from pathlib import Path
+import chromadb
+from chromadb.errors import ChromaError
+import numpy as np
 from dotenv import load_dotenv
 from strands import Agent, tool
 from strands.models.anthropic import AnthropicModel
-from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, Settings
+from llama_index.core import (
+    QueryBundle,
+    VectorStoreIndex,
+    SimpleDirectoryReader,
+    Settings,
+    StorageContext,
+)
+from llama_index.core.ingestion import run_transformations
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.llms.anthropic import Anthropic
+from llama_index.vector_stores.chroma import ChromaVectorStore
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.calc import evaluate  # noqa: E402
+from workshop.common.embeddings import (  # noqa: E402
+    EMBED_MODEL_NAME,
+    IPEX_AVAILABLE,
+    ORT_AVAILABLE,
+    BF16HuggingFaceEmbedding,
+    OnnxEmbedding,
+    configure_cpu_threads,
+    embedding_backend,
+    export_quantized_model,
+    pick_device,
+    sort_for_embedding,
+)
+from workshop.common.units import convert_temp  # noqa: E402
+
 # Path to sample documents (reuse from Kata 04)
 DOCS_PATH = Path(__file__).parent.parent / "kata-04-local-rag" / "sample_data" / "weather_docs"
 
-# Global query engine (initialized in setup)
+# Claude model used by both the RAG query engine and the agent
+RAG_MODEL = "claude-haiku-4-5-20251001"
+
+# Chroma store for the index, reused while the documents are unchanged (see docs_fingerprint)
+INDEX_CACHE_DIR = Path(__file__).parent / ".rag_cache"
+FINGERPRINT_FILE = "docs_fingerprint.txt"
+CHROMA_COLLECTION = "weather_knowledge"
+
+# Chroma's HNSW index settings; embeddings are unit-length, so cosine fits
+CHROMA_HNSW = {"hnsw:space": "cosine", "hnsw:construction_ef": 200, "hnsw:M": 16}
+
+# Folders with more files than this are read and parsed by a process pool;
+# below it, starting the workers costs more than it saves
+PARALLEL_LOAD_MIN_FILES = 32
+
+# Chunks embedded per forward pass (LlamaIndex defaults to 10); Apple GPUs
+# share memory with the system, so MPS gets smaller batches
+EMBED_BATCH_SIZE = 64
+MPS_EMBED_BATCH_SIZE = 16
+
+# Queries arriving within this window (up to the batch size) are embedded together
+QUERY_BATCH_WINDOW = 0.02
+QUERY_BATCH_SIZE = 8
+
+# Query embeddings kept on disk between runs (RAG_DEMO_CACHE=0 turns this off)
+QUERY_EMBED_STORE = "query_embeddings"
+
+# Chunks retrieved per knowledge-base search; each one adds prompt tokens,
+# and two cover a question in this small corpus
+SIMILARITY_TOP_K = 2
+
+# Global query engine and query batcher (initialized in setup)
 query_engine = None
+query_batcher = None
+
+
+class QueryCache:
+    """
+    Thread-safe LRU cache of knowledge-base answers with a time-to-live.
+
+    Agents often repeat a search within a session (retries, follow-up
+    turns); a hit returns the earlier answer without embedding, retrieval
+    or an LLM call. Entries expire after ttl_seconds so answers don't
+    outlive a document refresh for long.
+    """
+
+    def __init__(self, max_size: int = 2000, ttl_seconds: float = 600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """Store value under key, evicting the least recently used entry if full."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def get_stats(self) -> dict:
+        """Return hit/miss/eviction counts and the current size."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "size": len(self._entries),
+            }
+
+
+query_cache = QueryCache()
+
+
+class QueryEmbeddingStore:
+    """
+    Query embeddings saved on disk, so repeated runs skip the embedding pass.
+
+    The demo asks the same questions every run; with this store a CI rerun
+    or a second workshop run embeds none of them. Keys hash the embedding
+    backend and model with the query, so switching either one starts over.
+    """
+
+    def __init__(self, path: Path, namespace: str):
+        self._db = shelve.open(str(path))
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _key(self, query: str) -> str:
+        return hashlib.sha256(f"{self._namespace}\0{query}".encode()).hexdigest()
+
+    def get(self, query: str):
+        """Return the saved embedding for query, or None."""
+        with self._lock:
+            return self._db.get(self._key(query))
+
+    def put(self, query: str, embedding: list):
+        """Save the embedding for query."""
+        with self._lock:
+            self._db[self._key(query)] = embedding
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+@lru_cache(maxsize=None)
+def get_query_store(namespace: str) -> QueryEmbeddingStore:
+    """Open the on-disk query embedding store once per process."""
+    return QueryEmbeddingStore(INDEX_CACHE_DIR / QUERY_EMBED_STORE, namespace)
+
+
+class QueryEmbeddingBatcher:
+    """
+    Embed knowledge-base queries from concurrent tool calls in one pass.
+
+    The agent can call search_weather_knowledge several times in a turn.
+    Callers wait on embed() or aembed() while a background thread gathers whatever
+    queries arrive within QUERY_BATCH_WINDOW and runs a single forward
+    pass for all of them. A lone query waits at most one window. Queries
+    already in the optional store are answered without queueing.
+    """
+
+    def __init__(self, embed_model, max_batch: int = QUERY_BATCH_SIZE,
+                 max_wait: float = QUERY_BATCH_WINDOW,
+                 store: QueryEmbeddingStore = None):
+        self._embed_model = embed_model
+        self._store = store
+        self._max_batch = max_batch
+        self._max_wait = max_wait
+        self._queue = queue.Queue()
+        threading.Thread(target=self._run, name="query-batcher", daemon=True).start()
+
+    def submit(self, query: str) -> Future:
+        """Queue query for the next batch and return a future for its embedding."""
+        future = Future()
+        if self._store is not None:
+            embedding = self._store.get(query)
+            if embedding is not None:
+                future.set_result(embedding)
+                return future
+        self._queue.put((query, future))
+        return future
+
+    def embed(self, query: str) -> list:
+        """Return the embedding for query, computed alongside any concurrent ones."""
+        return self.submit(query).result()
+
+    async def aembed(self, query: str) -> list:
+        """Like embed(), but awaits the batch without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(query))
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self._max_wait
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                embeddings = self._embed_model.get_text_embedding_batch([q for q, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (query, future), embedding in zip(batch, embeddings):
+                    if self._store is not None:
+                        self._store.put(query, embedding)
+                    future.set_result(embedding)
+
+
+def docs_fingerprint(embed_backend: str, docs_path: Path = DOCS_PATH) -> str:
+    """
+    Hash the embedding build plus the name, size and modification time of
+    every document.
+
+    Any added, removed or edited file changes the result, which is all
+    that's needed to tell whether a saved index is still current; the
+    file contents themselves are never read. embed_backend (see
+    embedding_backend()) is included because switching between the GPU,
+    ONNX and CPU builds changes the vectors too.
+    """
+    digest = hashlib.sha256(f"{EMBED_MODEL_NAME}\0{embed_backend}".encode())
+    for path in sorted(p for p in docs_path.iterdir() if p.is_file()):
+        stat = path.stat()
+        digest.update(f"{path.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    """Return the shared Claude LLM used by the query engine."""
+    return Anthropic(model=RAG_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_agent_model():
+    """Return the shared Strands model, so re-created agents reuse one API client."""
+    return AnthropicModel(model_id=RAG_MODEL, max_tokens=1024)
 
 
 def setup_knowledge_base():
-    """Initialize the knowledge base and query engine."""
-    global query_engine
+    """
+    Initialize the knowledge base and query engine.
 
-    print("   Loading embedding model...")
-    embed_model = HuggingFaceEmbedding(
-        model_name="sentence-transformers/all-MiniLM-L6-v2"
-    )
+    The embeddings live in a persistent Chroma collection under
+    INDEX_CACHE_DIR, which searches them with a native HNSW index instead
+    of a Python scan. Later runs reuse it, skipping document loading and
+    embedding, until a document is added, removed or modified.
+    """
+    global query_engine, query_batcher
 
-    print("   Loading documents...")
-    documents = SimpleDirectoryReader(str(DOCS_PATH)).load_data()
-    print(f"   Loaded {len(documents)} document chunks")
+    print("   Loading embedding model...")
+    device = pick_device()
+    configure_cpu_threads()
+    if device != "cpu":
+        # A GPU outruns every CPU build below by a wide margin
+        embed_model = HuggingFaceEmbedding(
+            model_name=EMBED_MODEL_NAME,
+            device=device,
+            embed_batch_size=MPS_EMBED_BATCH_SIZE if device == "mps" else EMBED_BATCH_SIZE,
+        )
+    elif ORT_AVAILABLE:
+        # int8 ONNX build, exported on the first run and reused after
+        embed_model = OnnxEmbedding(export_quantized_model(), embed_batch_size=EMBED_BATCH_SIZE)
+    elif IPEX_AVAILABLE:
+        embed_model = BF16HuggingFaceEmbedding(embed_batch_size=EMBED_BATCH_SIZE)
+    else:
+        embed_model = HuggingFaceEmbedding(
+            model_name=EMBED_MODEL_NAME, embed_batch_size=EMBED_BATCH_SIZE
+        )
 
-    print("   Creating vector index...")
     Settings.embed_model = embed_model
-    index = VectorStoreIndex.from_documents(
-        documents,
-        embed_model=embed_model,
-        show_progress=True
-    )
+    backend = embedding_backend(embed_model)
+    fingerprint = docs_fingerprint(backend)
+    fingerprint_path = INDEX_CACHE_DIR / FINGERPRINT_FILE
+    client = chromadb.PersistentClient(path=str(INDEX_CACHE_DIR))
+
+    index = None
+    if fingerprint_path.exists() and fingerprint_path.read_text() == fingerprint:
+        try:
+            collection = client.get_collection(CHROMA_COLLECTION)
+        except (ValueError, ChromaError):
+            # Fingerprint survived but the collection didn't; rebuild below
+            print("   Saved vector index is missing, rebuilding...")
+        else:
+            print("   Loading saved vector index...")
+            vector_store = ChromaVectorStore(chroma_collection=collection)
+            index = VectorStoreIndex.from_vector_store(vector_store, embed_model=embed_model)
+
+    if index is None:
+        print("   Loading documents...")
+        reader = SimpleDirectoryReader(str(DOCS_PATH))
+        parallel = len(reader.input_files) > PARALLEL_LOAD_MIN_FILES
+        documents = reader.load_data(num_workers=os.cpu_count() if parallel else None)
+        print(f"   Loaded {len(documents)} document chunks")
+
+        print("   Creating vector index...")
+        # Start from an empty collection so stale chunks don't linger
+        client.get_or_create_collection(CHROMA_COLLECTION)
+        client.delete_collection(CHROMA_COLLECTION)
+        collection = client.create_collection(CHROMA_COLLECTION, metadata=CHROMA_HNSW)
+        storage_context = StorageContext.from_defaults(
+            vector_store=ChromaVectorStore(chroma_collection=collection)
+        )
+
+        # Chunk first so the chunks can be embedded in length-sorted batches
+        nodes = run_transformations(documents, Settings.transformations)
+        index = VectorStoreIndex(
+            nodes=sort_for_embedding(nodes),
+            storage_context=storage_context,
+            embed_model=embed_model,
+            show_progress=True
+        )
+        fingerprint_path.write_text(fingerprint)
 
     print("   Creating query engine with Claude...")
-    llm = Anthropic(model="claude-haiku-4-5-20251001")
     query_engine = index.as_query_engine(
-        llm=llm,
-        similarity_top_k=3
+        llm=get_llm(),
+        similarity_top_k=SIMILARITY_TOP_K,
+        response_mode="compact",  # Pack the chunks into as few LLM calls as fit
+        use_async=True,
     )
 
+    store = None
+    if os.environ.get("RAG_DEMO_CACHE", "1") != "0":
+        namespace = f"{backend}:{EMBED_MODEL_NAME}"
+        store = get_query_store(namespace)
+    query_batcher = QueryEmbeddingBatcher(embed_model, store=store)
+
     return query_engine
 
 
@@ -62,8 +384,21 @@ def setup_knowledge_base():
 # Tool Definitions
 # ==============================================================================
 
+def format_sources(source_nodes) -> str:
+    """Cite each source file once, with the best score any of its chunks got."""
+    best = {}
+    best_get = best.get
+    for node in source_nodes:
+        # NodeWithScore always has .score (None when unscored) and proxies .metadata
+        filename = node.metadata.get("file_name", "unknown")
+        score = node.score or 0.0
+        if score > best_get(filename, -1.0):
+            best[filename] = score
+    return ", ".join(f"{filename} (relevance: {score:.2f})" for filename, score in best.items())
+
+
 @tool
-def search_weather_knowledge(query: str) -> str:
+async def search_weather_knowledge(query: str) -> str:
     """Search the weather knowledge base for information about weather
     phenomena, forecasting, safety procedures, and meteorology.
 
@@ -79,22 +414,25 @@ def search_weather_knowledge(query: str) -> str:
     if query_engine is None:
         return "Error: Knowledge base not initialized"
 
+    cache_key = (query, SIMILARITY_TOP_K)
+    cached = query_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     try:
-        response = query_engine.query(query)
+        # A precomputed embedding lets the retriever skip its own embed call
+        # Async all the way down, so concurrent searches overlap their LLM calls
+        embedding = await query_batcher.aembed(query)
+        response = await query_engine.aquery(QueryBundle(query_str=query, embedding=embedding))
 
         # Format response with source information
         result = str(response.response)
 
         # Add source citations
         if response.source_nodes:
-            sources = []
-            for node in response.source_nodes:
-                filename = node.node.metadata.get("file_name", "unknown")
-                score = node.score if hasattr(node, "score") else 0
-                sources.append(f"{filename} (relevance: {score:.2f})")
-            unique_sources = list(dict.fromkeys(sources))  # Remove duplicates preserving order
-            result += f"\n\n[Sources: {', '.join(unique_sources)}]"
+            result += f"\n\n[Sources: {format_sources(response.source_nodes)}]"
 
+        query_cache.put(cache_key, result)
         return result
 
     except Exception as e:
@@ -110,30 +448,12 @@ def convert_temperature(value: float, from_unit: str, to_unit: str) -> str:
         from_unit: Source unit (C, F, or K).
         to_unit: Target unit (C, F, or K).
     """
-    from_unit = from_unit.upper()
-    to_unit = to_unit.upper()
-
-    # Convert to Celsius first
-    if from_unit == "C":
-        celsius = value
-    elif from_unit == "F":
-        celsius = (value - 32) * 5 / 9
-    elif from_unit == "K":
-        celsius = value - 273.15
-    else:
-        return f"Unknown source unit: {from_unit}. Use C, F, or K."
-
-    # Convert from Celsius to target
-    if to_unit == "C":
-        result = celsius
-    elif to_unit == "F":
-        result = celsius * 9 / 5 + 32
-    elif to_unit == "K":
-        result = celsius + 273.15
-    else:
-        return f"Unknown target unit: {to_unit}. Use C, F, or K."
+    try:
+        result = convert_temp(value, from_unit, to_unit)
+    except ValueError as e:
+        return str(e)
 
-    return f"{value}°{from_unit} = {result:.1f}°{to_unit}"
+    return f"{value}°{from_unit.upper()} = {result:.1f}°{to_unit.upper()}"
 
 
 @tool
@@ -143,34 +463,15 @@ def calculate(expression: str) -> str:
     Args:
         expression: A mathematical expression like '2 + 2', '10 * 5', or 'sqrt(16)'.
     """
-    import math
-
     try:
-        # Define safe functions
-        safe_dict = {
-            "abs": abs,
-            "round": round,
-            "min": min,
-            "max": max,
-            "sum": sum,
-            "sqrt": math.sqrt,
-            "pow": pow,
-            "pi": math.pi,
-        }
-
-        # Only allow safe characters
-        allowed_chars = set("0123456789+-*/.() ,")
-        expression_check = expression
-        for func in safe_dict.keys():
-            expression_check = expression_check.replace(func, "")
-
-        if not all(c in allowed_chars for c in expression_check):
-            return "Error: Expression contains invalid characters"
-
-        result = eval(expression, {"__builtins__": {}}, safe_dict)
-        return f"Result: {result}"
+        # Walks the parsed tree instead of eval(); oversized powers are refused.
+        # Normalized whitespace so trivially different spellings share a cache entry
+        result = evaluate(" ".join(expression.split()))
+    except (SyntaxError, ValueError) as e:
+        return f"Error: Invalid expression ({e})"
     except Exception as e:
         return f"Error calculating: {e}"
+    return f"Result: {result}"
 
 
 @tool
@@ -203,24 +504,80 @@ def get_weather_comfort_level(temperature_c: float, humidity: float) -> str:
         return f"Temperature: {temperature_c}°C. Comfort level: Comfortable"
 
 
+# Comfort labels indexed by the tier codes _comfort_tiers() returns
+_COMFORT_LABELS = (
+    "Comfortable",
+    "Moderate discomfort",
+    "Uncomfortable - stay hydrated",
+    "Very uncomfortable - caution advised",
+    "Dangerous - risk of heat stroke",
+    "Cold - dress warmly",
+    "Very cold - frostbite risk",
+)
+
+
+def _comfort_tiers(temps, hums):
+    """Vectorized get_weather_comfort_level: (heat_index, tier) arrays."""
+    heat_index = temps + 0.33 * hums - 0.7
+    hot = (temps >= 27) & (hums >= 40)
+    tiers = np.select(
+        [
+            hot & (heat_index > 40),
+            hot & (heat_index > 32),
+            hot & (heat_index > 27),
+            hot,
+            temps < -10,
+            temps < 0,
+        ],
+        [4, 3, 2, 1, 6, 5],
+        default=0,
+    ).astype(np.int8)
+    return heat_index, tiers
+
+
+@tool
+def assess_comfort_batch(temperatures_c: list[float], humidities: list[float]) -> str:
+    """Determine comfort levels for many temperature/humidity readings at once.
+
+    Use this instead of get_weather_comfort_level for forecast tables.
+
+    Args:
+        temperatures_c: Temperatures in Celsius.
+        humidities: Relative humidity percentages (0-100), one per temperature.
+    """
+    if len(temperatures_c) != len(humidities):
+        return "Error: temperatures_c and humidities must have the same length."
+
+    temps = np.asarray(temperatures_c, dtype=np.float64)
+    hums = np.asarray(humidities, dtype=np.float64)
+    heat_index, tiers = _comfort_tiers(temps, hums)
+
+    lines = []
+    for temp, hum, hi, tier in zip(temperatures_c, humidities,
+                                   heat_index.tolist(), tiers.tolist()):
+        if 1 <= tier <= 4:
+            reading = f"Heat index: {hi:.1f}°C"
+        else:
+            reading = f"Temperature: {temp}°C"
+        lines.append(f"{temp}°C / {hum}%: {reading}. "
+                     f"Comfort level: {_COMFORT_LABELS[tier]}")
+    return "\n".join(lines)
+
+
 # ==============================================================================
 # Agent Creation
 # ==============================================================================
 
 def create_weather_agent():
     """Create the RAG-enhanced weather agent."""
-    model = AnthropicModel(
-        model_id="claude-haiku-4-5-20251001",
-        max_tokens=1024
-    )
-
     agent = Agent(
-        model=model,
+        model=get_agent_model(),
         tools=[
             search_weather_knowledge,
             convert_temperature,
             calculate,
             get_weather_comfort_level,
+            assess_comfort_batch,
         ],
         system_prompt="""You are WeatherBot, an expert weather assistant with access to a comprehensive weather knowledge base.
 
@@ -228,7 +585,7 @@ Your capabilities:
 1. **Knowledge Base Search**: Use search_weather_knowledge to find accurate information about weather phenomena, forecasting, safety procedures, and meteorology.
 2. **Temperature Conversion**: Convert between Celsius, Fahrenheit, and Kelvin.
 3. **Calculations**: Perform mathematical calculations.
-4. **Comfort Assessment**: Evaluate weather comfort levels.
+4. **Comfort Assessment**: Evaluate weather comfort levels (assess_comfort_batch for many readings).
 
 Guidelines:
 - Always search the knowledge base for factual weather information
@@ -324,6 +681,9 @@ def main():
         except Exception as e:
             print(f"Error: {e}")
 
+    stats = query_cache.get_stats()
+    print(f"\nKnowledge-base cache: {stats['hits']} hits, {stats['misses']} misses")
+
     print("\n" + "=" * 70)
     print(" Kata 05 Complete!")
     print("=" * 70)
@@ -0,0 +1,104 @@
+"""
+Unit tests for the Kata 05 helpers and tools that need no model or API
+
+Run with: pytest test_kata05_tools.py -v
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+
+# Make the shared workshop package importable when running from the kata directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.testing import load_kata_module  # noqa: E402
+
+for _module in ("strands", "llama_index.core", "chromadb", "numpy", "dotenv"):
+    pytest.importorskip(_module)
+
+solution = load_kata_module(__file__)
+
+
+class TestCalculate:
+    """Tests for the calculate tool."""
+
+    def test_basic_expression(self):
+        assert solution.calculate("2 + 3 * 4") == "Result: 14"
+
+    @pytest.mark.parametrize("expression", [
+        "9 ** 10 ** 9",
+        "pow(9, 10 ** 9)",
+        "((9 ** 999) ** 999) ** 999",
+        "(1,) * 10 ** 9",
+    ])
+    def test_oversized_expressions_are_refused(self, expression):
+        assert solution.calculate(expression).startswith("Error: Invalid expression")
+
+    def test_code_is_not_executed(self):
+        assert solution.calculate("__import__('os')").startswith("Error: Invalid expression")
+
+
+class TestQueryCache:
+    """Tests for the QueryCache answer cache."""
+
+    def test_hit_and_miss(self):
+        cache = solution.QueryCache()
+        assert cache.get("q") is None
+        cache.put("q", "answer")
+        assert cache.get("q") == "answer"
+        assert cache.get_stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+    def test_evicts_least_recently_used(self):
+        cache = solution.QueryCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")  # "b" is now the oldest
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_expired_entry_is_dropped(self):
+        cache = solution.QueryCache(ttl_seconds=-1)
+        cache.put("q", "answer")
+        assert cache.get("q") is None
+        assert cache.get_stats()["size"] == 0
+
+
+def _node(file_name, score):
+    return SimpleNamespace(metadata={"file_name": file_name}, score=score)
+
+
+class TestFormatSources:
+    """Tests for format_sources."""
+
+    def test_one_entry_per_file_with_best_score(self):
+        nodes = [_node("a.md", 0.5), _node("b.md", 0.7), _node("a.md", 0.9)]
+        assert solution.format_sources(nodes) == "a.md (relevance: 0.90), b.md (relevance: 0.70)"
+
+    def test_unscored_and_unnamed_nodes(self):
+        nodes = [SimpleNamespace(metadata={}, score=None)]
+        assert solution.format_sources(nodes) == "unknown (relevance: 0.00)"
+
+    def test_no_sources(self):
+        assert solution.format_sources([]) == ""
+
+
+class TestComfortTiers:
+    """_comfort_tiers must label every reading like get_weather_comfort_level."""
+
+    TEMPERATURES = [-25.0, -10.5, -10.0, -0.1, 0.0, 15.0, 26.9, 27.0, 29.0, 33.0, 38.0, 45.0]
+    HUMIDITIES = [0.0, 39.9, 40.0, 55.0, 80.0, 100.0]
+
+    def test_matches_scalar_tool(self):
+        np = solution.np
+        readings = [(t, h) for t in self.TEMPERATURES for h in self.HUMIDITIES]
+        temps = np.array([t for t, _ in readings])
+        hums = np.array([h for _, h in readings])
+        heat_index, tiers = solution._comfort_tiers(temps, hums)
+
+        for (temp, hum), hi, tier in zip(readings, heat_index.tolist(), tiers.tolist()):
+            scalar = solution.get_weather_comfort_level(temp, hum)
+            assert scalar.endswith(f"Comfort level: {solution._COMFORT_LABELS[tier]}"), (temp, hum)
+            if 1 <= tier <= 4:
+                assert scalar.startswith(f"Heat index: {hi:.1f}°C"), (temp, hum)
@@ -6,6 +6,7 @@ for natural language project management and documentation access.
 
 Prerequisites:
     pip install 'strands-agents[anthropic]' atlassian-python-api
+    pip install selectolax  # optional, faster HTML-to-text for Confluence pages
     export ATLASSIAN_URL="https://your-domain.atlassian.net"
     export ATLASSIAN_EMAIL="your-email@example.com"
     export ATLASSIAN_API_TOKEN="your-api-token"
@@ -14,6 +15,9 @@ Prerequisites:
 
 import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 from dotenv import load_dotenv
 from strands import Agent, tool
 from strands.models.anthropic import AnthropicModel
@@ -21,11 +25,32 @@ from atlassian import Jira, Confluence
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.cache import ttl_cache  # noqa: E402
+
 # Atlassian configuration
 ATLASSIAN_URL = os.getenv("ATLASSIAN_URL")
 ATLASSIAN_EMAIL = os.getenv("ATLASSIAN_EMAIL")
 ATLASSIAN_API_TOKEN = os.getenv("ATLASSIAN_API_TOKEN")
 
+# Test queries answered at once in the demo; each one waits on Claude and Atlassian
+MAX_CONCURRENT_QUERIES = 4
+
+# Seconds to reuse the project and space lists, which change rarely
+PROJECTS_CACHE_TTL = 15 * 60
+SPACES_CACHE_TTL = 60 * 60
+
+# selectolax is a C-extension HTML parser; the regexes below are the fallback
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# Patterns for turning Confluence storage-format HTML into plain text
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
 # Global clients
 jira = None
 confluence = None
@@ -49,9 +74,35 @@ def setup_atlassian_clients():
         cloud=True
     )
 
+    # Lists cached from earlier clients may belong to another account
+    fetch_jira_projects.cache_clear()
+    fetch_confluence_spaces.cache_clear()
+
     return jira, confluence
 
 
+@ttl_cache(PROJECTS_CACHE_TTL)
+def fetch_jira_projects():
+    """Return the Jira project list."""
+    return jira.projects()
+
+
+@ttl_cache(SPACES_CACHE_TTL)
+def fetch_confluence_spaces():
+    """Return the first page of Confluence spaces."""
+    return confluence.get_all_spaces(limit=25)
+
+
+def storage_to_text(html: str) -> str:
+    """Strip the tags from Confluence storage-format HTML and collapse whitespace."""
+    if HTMLParser is not None:
+        root = HTMLParser(html).body
+        text = root.text(separator=" ") if root is not None else ""
+    else:
+        text = _TAG_RE.sub(" ", html)
+    return _WS_RE.sub(" ", text).strip()
+
+
 # ==============================================================================
 # Jira Tools
 # ==============================================================================
@@ -218,7 +269,7 @@ def list_jira_projects() -> str:
         return "Error: Jira client not initialized"
 
     try:
-        projects = jira.projects()
+        projects = fetch_jira_projects()
 
         if not projects:
             return "No projects found"
@@ -317,8 +368,7 @@ def get_confluence_page(page_title: str, space_key: str) -> str:
         body = page.get("body", {}).get("storage", {}).get("value", "")
 
         # Strip HTML tags for readability
-        text = re.sub(r'<[^>]+>', ' ', body)
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = storage_to_text(body)
 
         # Truncate if too long
         if len(text) > 3000:
@@ -348,7 +398,7 @@ def list_confluence_spaces() -> str:
         return "Error: Confluence client not initialized"
 
     try:
-        spaces = confluence.get_all_spaces(limit=25)
+        spaces = fetch_confluence_spaces()
         results = spaces.get("results", [])
 
         if not results:
@@ -371,8 +421,11 @@ def list_confluence_spaces() -> str:
 # Agent Creation
 # ==============================================================================
 
-def create_atlassian_agent():
-    """Create the Atlassian agent with Jira and Confluence tools."""
+def create_atlassian_agent(**agent_kwargs):
+    """Create the Atlassian agent with Jira and Confluence tools.
+
+    Extra keyword arguments are passed through to Agent.
+    """
     model = AnthropicModel(
         model_id="claude-haiku-4-5-20251001",
         max_tokens=1024
@@ -420,7 +473,8 @@ When creating issues:
 - Include relevant details in description
 - Suggest appropriate issue type
 
-Be helpful, efficient, and always confirm before creating or modifying data."""
+Be helpful, efficient, and always confirm before creating or modifying data.""",
+        **agent_kwargs,
     )
 
     return agent
@@ -473,14 +527,21 @@ def main():
         "Search Confluence for 'getting started'",
     ]
 
-    for query in test_queries:
-        print(f"\nUser: {query}")
-        print("-" * 40)
-        try:
-            response = agent(query)
-            print(f"Agent: {response}")
-        except Exception as e:
-            print(f"Error: {e}")
+    # The queries are independent, so they run concurrently and print as they
+    # finish. An Agent holds conversation state and serves one call at a time,
+    # so each query gets its own, with streaming off to keep output readable.
+    def run_test_query(query):
+        return create_atlassian_agent(callback_handler=None)(query)
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_QUERIES) as executor:
+        futures = {executor.submit(run_test_query, query): query for query in test_queries}
+        for future in as_completed(futures):
+            print(f"\nUser: {futures[future]}")
+            print("-" * 40)
+            try:
+                print(f"Agent: {future.result()}")
+            except Exception as e:
+                print(f"Error: {e}")
 
     # Interactive mode
     print("\n" + "=" * 70)
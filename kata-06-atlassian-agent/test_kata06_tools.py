@@ -0,0 +1,35 @@
+"""
+Unit tests for the Kata 06 helpers that need no Atlassian instance
+
+Run with: pytest test_kata06_tools.py -v
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+import pytest
+
+# Make the shared workshop package importable when running from the kata directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.testing import load_kata_module  # noqa: E402
+
+for _module in ("strands", "atlassian", "dotenv"):
+    pytest.importorskip(_module)
+
+solution = load_kata_module(__file__)
+
+
+class TestStorageToText:
+    """Tests for storage_to_text."""
+
+    def test_strips_tags_and_collapses_whitespace(self):
+        html = "<h1>Title</h1>\n<p>First   line<br/>second <b>bold</b></p>"
+        assert solution.storage_to_text(html) == "Title First line second bold"
+
+    def test_regex_fallback_matches(self):
+        html = "<p>One</p>  <ul><li>two</li><li>three</li></ul>"
+        with patch.object(solution, "HTMLParser", None):
+            assert solution.storage_to_text(html) == "One two three"
+
+    def test_empty_input(self):
+        assert solution.storage_to_text("") == ""
@@ -19,18 +19,76 @@ Endpoints:
 
 import json
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import re
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
 from urllib.parse import urlparse, parse_qs, quote
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
+# Make the shared workshop package importable when running this file directly
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.cache import ttl_cache  # noqa: E402
+
 # Atlassian configuration (consistent with kata-06)
 ATLASSIAN_URL = os.getenv("ATLASSIAN_URL", "").rstrip("/")
 ATLASSIAN_EMAIL = os.getenv("ATLASSIAN_EMAIL")
 ATLASSIAN_API_TOKEN = os.getenv("ATLASSIAN_API_TOKEN")
 
+# Seconds to reuse the project and space lists, which change rarely
+PROJECTS_CACHE_TTL = 15 * 60
+SPACES_CACHE_TTL = 60 * 60
+
+# Request pacing until Atlassian's x-ratelimit-* headers give the real
+# limits: sustained requests per second, and how many may burst at once
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_RATE_BURST = 10
+
+# Times a rate-limited (429) request is resent after waiting Retry-After
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Server errors worth retrying, how many times, and the base of the
+# exponential backoff in seconds (0.5, 1, 2)
+SERVER_ERROR_STATUSES = (500, 502, 503, 504)
+MAX_SERVER_ERROR_RETRIES = 3
+SERVER_ERROR_BACKOFF = 0.5
+
+# Most issues /search/jql returns per page when fields are requested
+JIRA_SEARCH_PAGE_SIZE = 100
+
+# Results the search tools return by default, and the most they will
+# fetch (larger requests are clamped to these)
+DEFAULT_MAX_RESULTS = 10
+JIRA_MAX_RESULTS = 1000
+CONFLUENCE_MAX_RESULTS = 100
+
+# Characters of page text confluence_get_page returns unless raw is requested
+PAGE_TEXT_LIMIT = 3000
+
+# selectolax is a C-extension HTML parser; the regexes below are the fallback
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+# orjson serializes responses straight to bytes, several times faster than json
+try:
+    from orjson import dumps as _json_dumps
+except ImportError:
+    def _json_dumps(data):
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+# Patterns for turning Confluence storage-format HTML into plain text
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
 # Tool definitions
 TOOLS = [
     # Jira tools
@@ -44,7 +102,7 @@ TOOLS = [
         "description": "Search Jira issues using JQL (Jira Query Language)",
         "parameters": [
             {"name": "jql", "type": "string", "description": "JQL query string", "required": False},
-            {"name": "max_results", "type": "integer", "description": "Maximum results (default 10)", "required": False}
+            {"name": "max_results", "type": "integer", "description": "Maximum results (default 10, at most 1000)", "required": False}
         ]
     },
     {
@@ -75,14 +133,15 @@ TOOLS = [
         "description": "Search Confluence pages by text",
         "parameters": [
             {"name": "query", "type": "string", "description": "Search query text", "required": True},
-            {"name": "max_results", "type": "integer", "description": "Maximum results (default 10)", "required": False}
+            {"name": "max_results", "type": "integer", "description": "Maximum results (default 10, at most 100)", "required": False}
         ]
     },
     {
         "name": "confluence_get_page",
         "description": "Get content of a specific Confluence page",
         "parameters": [
-            {"name": "page_id", "type": "string", "description": "Page ID", "required": True}
+            {"name": "page_id", "type": "string", "description": "Page ID", "required": True},
+            {"name": "raw", "type": "boolean", "description": "Return the full storage-format HTML instead of truncated plain text (default false)", "required": False}
         ]
     }
 ]
@@ -93,88 +152,260 @@ def get_auth():
     return (ATLASSIAN_EMAIL, ATLASSIAN_API_TOKEN)
 
 
-def jira_request(method, endpoint, data=None):
+def create_session():
+    """
+    Create the HTTP session shared by every Jira and Confluence call.
+
+    Pooled connections let repeated tool calls reuse an open TLS
+    connection to Atlassian instead of handshaking each time. Idempotent
+    requests are retried with backoff on server errors; rate limiting
+    (429) is handled by send_request().
+    """
+    session = requests.Session()
+    session.auth = get_auth()
+    session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
+    adapter = HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=100,
+        max_retries=Retry(
+            total=MAX_SERVER_ERROR_RETRIES,
+            backoff_factor=SERVER_ERROR_BACKOFF,
+            status_forcelist=SERVER_ERROR_STATUSES,
+            # A 429 (and its Retry-After) is left to send_request(), which
+            # paces the resend through the token bucket; retrying it here too
+            # would multiply the attempts and bypass the bucket
+            respect_retry_after_header=False,
+            # Hand back the last 5xx response, not a RetryError, so the
+            # tools can report its status and body
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    return session
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by every request thread.
+
+    Tokens refill at rate per second up to capacity, and each request
+    takes one, so bursts go straight out while sustained traffic is
+    paced to the rate instead of being answered with 429s.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def update_from_headers(self, headers):
+        """Adopt the limits Atlassian reports in x-ratelimit-* headers, if any."""
+        try:
+            fill_rate = float(headers["x-ratelimit-fillrate"])
+            interval = float(headers.get("x-ratelimit-interval-seconds", 1))
+        except (KeyError, ValueError):
+            return
+        try:
+            capacity = float(headers["x-ratelimit-limit"])
+        except (KeyError, ValueError):
+            capacity = None
+
+        with self._lock:
+            if fill_rate > 0 and interval > 0:
+                self.rate = fill_rate / interval
+            if capacity and capacity >= 1:
+                self.capacity = capacity
+                self._tokens = min(self._tokens, capacity)
+
+
+# Jira and Confluence share the ATLASSIAN_URL host, and so its rate limit
+_session = create_session()
+_rate_limiter = TokenBucket(DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+
+
+def retry_after_seconds(response, default=1.0):
+    """Return the Retry-After delay of a 429 response in seconds."""
+    try:
+        return max(0.0, float(response.headers.get("Retry-After", default)))
+    except ValueError:  # HTTP-date form, not used by Atlassian
+        return default
+
+
+def send_request(method, url, data=None, retry_server_errors=False):
+    """
+    Send a request through the shared session, paced by the rate limiter.
+
+    A 429 means the request was not processed, so it is resent (even a
+    POST) after the server's Retry-After delay, up to MAX_RATE_LIMIT_RETRIES.
+
+    The session retries 5xx responses only for idempotent methods, never
+    for POST. A POST that is safe to repeat, such as a search, passes
+    retry_server_errors=True to get the same retries here.
+    """
+    rate_limit_retries = server_error_retries = 0
+    while True:
+        _rate_limiter.acquire()
+        response = _session.request(method, url, json=data if data else None)
+        _rate_limiter.update_from_headers(response.headers)
+        if response.status_code == 429 and rate_limit_retries < MAX_RATE_LIMIT_RETRIES:
+            rate_limit_retries += 1
+            time.sleep(retry_after_seconds(response))
+        elif (retry_server_errors and response.status_code in SERVER_ERROR_STATUSES
+                and server_error_retries < MAX_SERVER_ERROR_RETRIES):
+            time.sleep(SERVER_ERROR_BACKOFF * 2 ** server_error_retries)
+            server_error_retries += 1
+        else:
+            return response
+
+
+def jira_request(method, endpoint, data=None, retry_server_errors=False):
     """Make a request to Jira API."""
-    url = f"{ATLASSIAN_URL}/rest/api/3{endpoint}"
-    headers = {"Accept": "application/json", "Content-Type": "application/json"}
-
-    response = requests.request(
-        method=method,
-        url=url,
-        headers=headers,
-        auth=get_auth(),
-        json=data if data else None
+    return send_request(
+        method, f"{ATLASSIAN_URL}/rest/api/3{endpoint}", data, retry_server_errors
     )
-    return response
 
 
 def confluence_request(method, endpoint, data=None):
     """Make a request to Confluence API."""
-    url = f"{ATLASSIAN_URL}/wiki/rest/api{endpoint}"
-    headers = {"Accept": "application/json", "Content-Type": "application/json"}
-
-    response = requests.request(
-        method=method,
-        url=url,
-        headers=headers,
-        auth=get_auth(),
-        json=data if data else None
-    )
-    return response
+    return send_request(method, f"{ATLASSIAN_URL}/wiki/rest/api{endpoint}", data)
+
+
+@ttl_cache(PROJECTS_CACHE_TTL)
+def fetch_jira_projects():
+    """Return the raw Jira project list; raises HTTPError on failure."""
+    response = jira_request("GET", "/project")
+    response.raise_for_status()
+    return response.json()
+
+
+@ttl_cache(SPACES_CACHE_TTL)
+def fetch_confluence_spaces():
+    """Return the raw Confluence space list; raises HTTPError on failure."""
+    response = confluence_request("GET", "/space")
+    response.raise_for_status()
+    return response.json()
+
+
+def parse_max_results(params, limit):
+    """
+    Return params["max_results"] as an int, clamped to limit.
+
+    Raises ValueError unless it is a whole number of at least 1.
+    """
+    value = params.get("max_results", DEFAULT_MAX_RESULTS)
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        count = 0
+    # Reject True and 2.5 too, which int() would quietly accept
+    if isinstance(value, bool) or count < 1 or (count != value and not isinstance(value, str)):
+        raise ValueError(f"max_results must be a positive integer, got {value!r}")
+    return min(count, limit)
+
+
+def storage_to_text(html: str) -> str:
+    """Strip the tags from Confluence storage-format HTML and collapse whitespace."""
+    if HTMLParser is not None:
+        root = HTMLParser(html).body
+        text = root.text(separator=" ") if root is not None else ""
+    else:
+        text = _TAG_RE.sub(" ", html)
+    return _WS_RE.sub(" ", text).strip()
 
 
 # Tool implementations
 def tool_jira_get_projects(params):
     """List all Jira projects."""
-    response = jira_request("GET", "/project")
-    if response.status_code == 200:
-        projects = response.json()
-        return {
-            "projects": [
-                {"key": p["key"], "name": p["name"], "id": p["id"]}
-                for p in projects
-            ]
-        }
-    return {"error": response.text, "status_code": response.status_code}
+    try:
+        projects = fetch_jira_projects()
+    except requests.HTTPError as e:
+        return {"error": e.response.text, "status_code": e.response.status_code}
+    return {
+        "projects": [
+            {"key": p["key"], "name": p["name"], "id": p["id"]}
+            for p in projects
+        ]
+    }
 
 
 def tool_jira_search_issues(params):
     """Search Jira issues with JQL."""
     jql = params.get("jql", "ORDER BY created DESC")
-    max_results = params.get("max_results", 10)
+    try:
+        max_results = parse_max_results(params, JIRA_MAX_RESULTS)
+    except ValueError as e:
+        return {"error": str(e), "status_code": 400}
 
     # Use the new /search/jql endpoint (old /search was removed in 2024)
-    # Need to request fields explicitly with new API
-    fields = "summary,status,issuetype,created"
-    response = jira_request("GET", f"/search/jql?jql={quote(jql)}&maxResults={max_results}&fields={fields}")
-    if response.status_code == 200:
+    # Need to request fields explicitly with new API. POSTing the query as
+    # JSON keeps long JQL out of the URL, where it could hit length limits.
+    fields = ["summary", "status", "issuetype", "created"]
+
+    # Results come in pages of up to JIRA_SEARCH_PAGE_SIZE. The endpoint
+    # pages with a cursor (nextPageToken) rather than startAt offsets, so
+    # each page has to be requested after the previous one arrives.
+    issue_list = []
+    data = {}
+    next_page_token = None
+    while len(issue_list) < max_results:
+        body = {
+            "jql": jql,
+            "fields": fields,
+            "maxResults": min(JIRA_SEARCH_PAGE_SIZE, max_results - len(issue_list)),
+        }
+        if next_page_token:
+            body["nextPageToken"] = next_page_token
+        # A search changes nothing, so retry server errors despite the POST
+        response = jira_request("POST", "/search/jql", body, retry_server_errors=True)
+        if response.status_code != 200:
+            return {"error": response.text, "status_code": response.status_code}
+
         data = response.json()
-        issues = []
         # New API returns issues directly or in 'issues' key
-        issue_list = data if isinstance(data, list) else data.get("issues", [])
-        for issue in issue_list:
-            # Handle both old format (fields nested) and new format (flat)
-            if "fields" in issue:
-                # Old format
-                issues.append({
-                    "key": issue["key"],
-                    "summary": issue["fields"]["summary"],
-                    "status": issue["fields"]["status"]["name"],
-                    "type": issue["fields"]["issuetype"]["name"],
-                    "created": issue["fields"]["created"]
-                })
-            else:
-                # New format - fields may be at top level or use different keys
-                issues.append({
-                    "key": issue.get("key", issue.get("id", "unknown")),
-                    "summary": issue.get("summary", issue.get("summaryText", "No summary")),
-                    "status": issue.get("status", {}).get("name", "Unknown") if isinstance(issue.get("status"), dict) else str(issue.get("status", "Unknown")),
-                    "type": issue.get("issuetype", {}).get("name", "Unknown") if isinstance(issue.get("issuetype"), dict) else str(issue.get("issuetype", "Unknown")),
-                    "created": issue.get("created", "Unknown")
-                })
-        total = data.get("total", len(issues)) if isinstance(data, dict) else len(issues)
-        return {"total": total, "issues": issues}
-    return {"error": response.text, "status_code": response.status_code}
+        page = data if isinstance(data, list) else data.get("issues", [])
+        issue_list.extend(page)
+        next_page_token = data.get("nextPageToken") if isinstance(data, dict) else None
+        if not page or not next_page_token:
+            break
+
+    issues = []
+    for issue in issue_list:
+        # Handle both old format (fields nested) and new format (flat)
+        if "fields" in issue:
+            # Old format
+            issues.append({
+                "key": issue["key"],
+                "summary": issue["fields"]["summary"],
+                "status": issue["fields"]["status"]["name"],
+                "type": issue["fields"]["issuetype"]["name"],
+                "created": issue["fields"]["created"]
+            })
+        else:
+            # New format - fields may be at top level or use different keys
+            issues.append({
+                "key": issue.get("key", issue.get("id", "unknown")),
+                "summary": issue.get("summary", issue.get("summaryText", "No summary")),
+                "status": issue.get("status", {}).get("name", "Unknown") if isinstance(issue.get("status"), dict) else str(issue.get("status", "Unknown")),
+                "type": issue.get("issuetype", {}).get("name", "Unknown") if isinstance(issue.get("issuetype"), dict) else str(issue.get("issuetype", "Unknown")),
+                "created": issue.get("created", "Unknown")
+            })
+    total = data.get("total", len(issues)) if isinstance(data, dict) else len(issues)
+    return {"total": total, "issues": issues}
 
 
 def tool_jira_get_issue(params):
@@ -237,28 +468,31 @@ def tool_jira_create_issue(params):
 
 def tool_confluence_get_spaces(params):
     """List all Confluence spaces."""
-    response = confluence_request("GET", "/space")
-    if response.status_code == 200:
-        data = response.json()
-        spaces = []
-        for space in data.get("results", []):
-            spaces.append({
-                "key": space["key"],
-                "name": space["name"],
-                "type": space["type"],
-                "id": space["id"]
-            })
-        return {"spaces": spaces}
-    return {"error": response.text, "status_code": response.status_code}
+    try:
+        data = fetch_confluence_spaces()
+    except requests.HTTPError as e:
+        return {"error": e.response.text, "status_code": e.response.status_code}
+    spaces = []
+    for space in data.get("results", []):
+        spaces.append({
+            "key": space["key"],
+            "name": space["name"],
+            "type": space["type"],
+            "id": space["id"]
+        })
+    return {"spaces": spaces}
 
 
 def tool_confluence_search(params):
     """Search Confluence pages."""
     query = params.get("query")
-    max_results = params.get("max_results", 10)
 
     if not query:
         return {"error": "query is required"}
+    try:
+        max_results = parse_max_results(params, CONFLUENCE_MAX_RESULTS)
+    except ValueError as e:
+        return {"error": str(e), "status_code": 400}
 
     # Search by title first (more precise), fall back to text search
     # Use title~ for title search, text~ for full-text search
@@ -295,13 +529,23 @@ def tool_confluence_get_page(params):
     response = confluence_request("GET", f"/content/{page_id}?expand=body.storage,space,version")
     if response.status_code == 200:
         page = response.json()
-        return {
+        body = page.get("body", {}).get("storage", {}).get("value", "")
+        result = {
             "id": page["id"],
             "title": page["title"],
             "space": page.get("space", {}).get("key"),
             "version": page.get("version", {}).get("number"),
-            "body": page.get("body", {}).get("storage", {}).get("value", "")
         }
+        if params.get("raw"):
+            result["body"] = body
+            return result
+
+        # Storage bodies can run to hundreds of KB; pass on only the start
+        # of the text, which is all an agent reads anyway
+        text = storage_to_text(body)
+        result["body"] = text[:PAGE_TEXT_LIMIT]
+        result["truncated"] = len(text) > PAGE_TEXT_LIMIT
+        return result
     return {"error": response.text, "status_code": response.status_code}
 
 
@@ -320,13 +564,20 @@ TOOL_HANDLERS = {
 class MCPRequestHandler(BaseHTTPRequestHandler):
     """HTTP request handler for MCP server."""
 
+    # HTTP/1.1 keeps the connection open between requests, so a client can
+    # make many tool calls over one socket. Every response must therefore
+    # carry a Content-Length.
+    protocol_version = "HTTP/1.1"
+
     def _send_json(self, data, status=200):
-        """Send JSON response."""
+        """Send JSON response (compact; pipe through `python -m json.tool` to read)."""
+        body = _json_dumps(data)
         self.send_response(status)
         self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        self.wfile.write(json.dumps(data, indent=2).encode())
+        self.wfile.write(body)
 
     def do_OPTIONS(self):
         """Handle CORS preflight."""
@@ -334,6 +585,7 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
         self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def do_GET(self):
@@ -418,7 +670,9 @@ def main():
     print("\nPress Ctrl+C to stop\n")
     print("=" * 60)
 
-    server = HTTPServer(("", port), MCPRequestHandler)
+    # One thread per request, so a slow Atlassian call doesn't stall other
+    # clients; the handlers share only the pooled requests session
+    server = ThreadingHTTPServer(("", port), MCPRequestHandler)
     try:
         server.serve_forever()
     except KeyboardInterrupt:
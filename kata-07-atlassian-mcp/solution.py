@@ -33,11 +33,13 @@ class MCPClient:
 
     def __init__(self, server_url: str):
         self.server_url = server_url.rstrip("/")
+        # One session reuses the kept-alive connection for every call
+        self.session = requests.Session()
 
     def health_check(self) -> bool:
         """Check if the MCP server is running."""
         try:
-            response = requests.get(f"{self.server_url}/health", timeout=5)
+            response = self.session.get(f"{self.server_url}/health", timeout=5)
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -45,7 +47,7 @@ class MCPClient:
     def list_tools(self) -> list:
         """Get list of available tools from the MCP server."""
         try:
-            response = requests.get(f"{self.server_url}/mcp/v1/tools")
+            response = self.session.get(f"{self.server_url}/mcp/v1/tools")
             response.raise_for_status()
             return response.json().get("tools", [])
         except requests.exceptions.RequestException as e:
@@ -55,7 +57,7 @@ class MCPClient:
     def invoke(self, tool_name: str, parameters: dict = None) -> dict:
         """Invoke an MCP tool."""
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.server_url}/mcp/v1/invoke",
                 json={"name": tool_name, "parameters": parameters or {}},
                 timeout=30
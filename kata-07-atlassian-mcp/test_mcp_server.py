@@ -0,0 +1,148 @@
+"""
+Unit tests for the MCP server helpers that need no Atlassian instance
+
+Run with: pytest test_mcp_server.py -v
+
+Requests are answered by a mocked session, so no network is used.
+"""
+
+import io
+import sys
+from pathlib import Path
+from unittest.mock import Mock, patch
+import pytest
+
+# Make the shared workshop package importable when running from the kata directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from workshop.common.testing import load_kata_module  # noqa: E402
+
+pytest.importorskip("requests")
+pytest.importorskip("dotenv")
+
+server = load_kata_module(__file__, "mcp_server.py")
+
+
+def _response(status_code, headers=None):
+    return Mock(status_code=status_code, headers=headers or {})
+
+
+class TestTokenBucket:
+    """Tests for the TokenBucket rate limiter."""
+
+    def test_burst_up_to_capacity_does_not_wait(self):
+        bucket = server.TokenBucket(rate=1.0, capacity=5)
+        with patch.object(server.time, "sleep") as sleep:
+            for _ in range(5):
+                bucket.acquire()
+        sleep.assert_not_called()
+
+    def test_waits_once_empty(self):
+        bucket = server.TokenBucket(rate=1000.0, capacity=1)
+        bucket.acquire()
+        with patch.object(server.time, "sleep", wraps=server.time.sleep) as sleep:
+            bucket.acquire()
+        sleep.assert_called()
+
+    def test_adopts_rate_limit_headers(self):
+        bucket = server.TokenBucket(rate=10.0, capacity=10)
+        bucket.update_from_headers({
+            "x-ratelimit-fillrate": "50",
+            "x-ratelimit-interval-seconds": "10",
+            "x-ratelimit-limit": "3",
+        })
+        assert bucket.rate == 5.0
+        assert bucket.capacity == 3.0
+        assert bucket._tokens <= 3.0
+
+    @pytest.mark.parametrize("headers", [
+        {},
+        {"x-ratelimit-fillrate": "fast"},
+        {"x-ratelimit-fillrate": "0"},
+    ])
+    def test_ignores_missing_or_bad_headers(self, headers):
+        bucket = server.TokenBucket(rate=10.0, capacity=10)
+        bucket.update_from_headers(headers)
+        assert (bucket.rate, bucket.capacity) == (10.0, 10)
+
+
+class TestSendRequest:
+    """Tests for send_request's retries."""
+
+    def _send(self, responses, **kwargs):
+        session = Mock()
+        session.request.side_effect = responses
+        with patch.object(server, "_session", session), patch.object(server.time, "sleep"):
+            response = server.send_request("POST", "https://example.test/x", {"a": 1}, **kwargs)
+        return response, session.request.call_count
+
+    def test_rate_limited_request_is_resent(self):
+        response, calls = self._send([_response(429, {"Retry-After": "0"}), _response(200)])
+        assert (response.status_code, calls) == (200, 2)
+
+    def test_gives_up_after_max_rate_limit_retries(self):
+        responses = [_response(429)] * (server.MAX_RATE_LIMIT_RETRIES + 1)
+        response, calls = self._send(responses)
+        assert (response.status_code, calls) == (429, server.MAX_RATE_LIMIT_RETRIES + 1)
+
+    def test_session_leaves_rate_limits_to_send_request(self):
+        # Answer at the connection-pool level, below the adapter's Retry, so
+        # any resend the adapter made on its own would show up in the count
+        from urllib3.connectionpool import HTTPConnectionPool
+        from urllib3.response import HTTPResponse
+
+        def rate_limited(*args, **kwargs):
+            return HTTPResponse(body=io.BytesIO(b"{}"), status=429, headers={"Retry-After": "0"},
+                                preload_content=False)
+
+        with patch.object(HTTPConnectionPool, "_make_request", side_effect=rate_limited) as sent, \
+                patch.object(server.time, "sleep"):
+            response = server.send_request("GET", "https://example.test/rest/api/3/project")
+        assert response.status_code == 429
+        assert sent.call_count == server.MAX_RATE_LIMIT_RETRIES + 1
+
+    def test_post_server_error_is_not_retried_by_default(self):
+        response, calls = self._send([_response(503), _response(200)])
+        assert (response.status_code, calls) == (503, 1)
+
+    def test_post_server_error_is_retried_when_asked(self):
+        response, calls = self._send([_response(503), _response(502), _response(200)],
+                                     retry_server_errors=True)
+        assert (response.status_code, calls) == (200, 3)
+
+
+class TestParseMaxResults:
+    """Tests for parse_max_results."""
+
+    @pytest.mark.parametrize("params, expected", [
+        ({}, server.DEFAULT_MAX_RESULTS),
+        ({"max_results": 5}, 5),
+        ({"max_results": "7"}, 7),
+        ({"max_results": 10 ** 9}, 100),
+    ])
+    def test_valid_values(self, params, expected):
+        assert server.parse_max_results(params, 100) == expected
+
+    @pytest.mark.parametrize("value", ["ten", 0, -3, 2.5, True, None])
+    def test_invalid_values(self, value):
+        with pytest.raises(ValueError):
+            server.parse_max_results({"max_results": value}, 100)
+
+    def test_search_tool_returns_400_error(self):
+        result = server.tool_jira_search_issues({"max_results": "ten"})
+        assert result["status_code"] == 400
+
+
+class TestStorageToText:
+    """Tests for storage_to_text."""
+
+    def test_strips_tags_and_collapses_whitespace(self):
+        html = "<h1>Title</h1>\n<p>First   line<br/>second <b>bold</b></p>"
+        assert server.storage_to_text(html) == "Title First line second bold"
+
+    def test_regex_fallback_matches(self):
+        html = "<p>One</p>  <ul><li>two</li><li>three</li></ul>"
+        with patch.object(server, "HTMLParser", None):
+            assert server.storage_to_text(html) == "One two three"
+
+    def test_empty_input(self):
+        assert server.storage_to_text("") == ""
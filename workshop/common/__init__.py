@@ -0,0 +1,6 @@
+"""Common utilities used across katas."""
+
+from workshop.common.cache import ttl_cache
+from workshop.common.colors import Colors, header, prompt, response, stats, todo
+
+__all__ = ["Colors", "header", "prompt", "response", "stats", "todo", "ttl_cache"]
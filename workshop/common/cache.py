@@ -0,0 +1,47 @@
+"""
+Time-based result cache for slow-changing API lookups.
+
+Jira project and Confluence space lists change over hours or days, yet
+agents ask for them in almost every session. Keeping them for a few
+minutes saves the round trip and stays clear of Atlassian's rate limits.
+"""
+
+import functools
+import threading
+import time
+
+
+def ttl_cache(ttl_seconds):
+    """
+    Cache a function's results for ttl_seconds, keyed by its arguments.
+
+    Meant for functions called with a handful of distinct arguments; the
+    cache is not size-bounded. Exceptions are not cached, so a failed call
+    is retried next time. Safe to use from several threads. Like
+    functools.lru_cache, the wrapper has a cache_clear() method.
+    """
+    def decorator(fn):
+        entries = {}
+        lock = threading.Lock()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with lock:
+                entry = entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+
+            value = fn(*args, **kwargs)
+            with lock:
+                entries[key] = (value, time.monotonic() + ttl_seconds)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,111 @@
+"""
+Safe arithmetic evaluator behind the calculate() tools.
+
+The model passes user-controlled text to calculate(), so expressions are
+never handed to eval(). The parsed tree is walked instead, and only
+numbers, arithmetic, a few math functions and constants are allowed.
+
+Sizes are guarded too, because one expression can otherwise run for
+minutes or exhaust memory: 9 ** 10 ** 9, pow(9, 10 ** 9), a nested
+(9 ** 999) ** 999 whose exponents each look small, or (1,) * 10 ** 9.
+Every power, from ** or pow() alike, goes through checked_pow(),
+round() refuses ndigits that would make it compute 10 ** 10 ** 9, and
+operators only accept numbers.
+"""
+
+import ast
+import math
+import operator
+from functools import lru_cache
+
+# Largest exponent a power may use
+MAX_EXPONENT = 1000
+
+# Largest integer power, in bits (about 3000 decimal digits, under the
+# 4300-digit limit Python puts on printing an int)
+MAX_POW_BITS = 10_000
+
+
+def checked_pow(base, exponent, *modulus):
+    """pow() that raises ValueError instead of computing an oversized result."""
+    if not isinstance(base, (int, float)) or not isinstance(exponent, (int, float)):
+        raise ValueError("pow() only works on numbers")
+    if abs(exponent) > MAX_EXPONENT:
+        raise ValueError(f"Exponent too large (max {MAX_EXPONENT})")
+    if (isinstance(base, int) and isinstance(exponent, int)
+            and base.bit_length() * exponent > MAX_POW_BITS):
+        raise ValueError(f"Result too large (max {MAX_POW_BITS} bits)")
+    return pow(base, exponent, *modulus)
+
+
+def checked_round(number, ndigits=None):
+    """round() that refuses an ndigits it would have to raise 10 to."""
+    if ndigits is not None and abs(ndigits) > MAX_EXPONENT:
+        raise ValueError(f"ndigits too large (max {MAX_EXPONENT})")
+    return round(number, ndigits)
+
+
+# Operators, functions and constants evaluate() accepts
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: checked_pow,
+}
+_UNARY_OPS = {ast.USub: operator.neg, ast.UAdd: operator.pos}
+SAFE_FUNCS = {
+    "abs": abs,
+    "round": checked_round,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "pow": checked_pow,
+    "sqrt": math.sqrt,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+}
+SAFE_CONSTS = {"pi": math.pi, "e": math.e}
+
+
+@lru_cache(maxsize=256)
+def _parse_expression(expression: str) -> ast.expr:
+    """Parse an expression once; repeated expressions reuse the cached tree."""
+    return ast.parse(expression.strip(), mode="eval").body
+
+
+def _eval_node(node: ast.expr):
+    """Evaluate a whitelisted expression node, rejecting everything else."""
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        left, right = _eval_node(node.left), _eval_node(node.right)
+        # A tuple operand would let (1,) * 10 ** 9 build a billion-item tuple
+        if not isinstance(left, (int, float)) or not isinstance(right, (int, float)):
+            raise ValueError("Operators only work on numbers")
+        return _BIN_OPS[type(node.op)](left, right)
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if isinstance(node, ast.Name) and node.id in SAFE_CONSTS:
+        return SAFE_CONSTS[node.id]
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+            and node.func.id in SAFE_FUNCS and not node.keywords):
+        return SAFE_FUNCS[node.func.id](*(_eval_node(arg) for arg in node.args))
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return tuple(_eval_node(elt) for elt in node.elts)
+    raise ValueError(f"Unsupported syntax: {ast.dump(node)[:40]}")
+
+
+def evaluate(expression: str):
+    """Evaluate an arithmetic expression without eval().
+
+    Raises:
+        SyntaxError: If the expression does not parse.
+        ValueError: If it uses anything outside the allowlist, or a power
+            exceeds MAX_EXPONENT / MAX_POW_BITS.
+        ArithmeticError: For errors in the arithmetic itself (e.g. division by zero).
+    """
+    return _eval_node(_parse_expression(expression))
@@ -0,0 +1,68 @@
+"""
+ANSI color helpers for pretty terminal output.
+
+Shared by the katas so the Colors class is defined (and byte-compiled)
+in one place instead of being copied into every script.
+
+Colors are turned off when stdout is not a terminal or NO_COLOR is set
+(https://no-color.org), e.g. when output is piped to a file or CI log.
+"""
+
+import os
+import sys
+
+
+class Colors:
+    """ANSI color codes for pretty terminal output."""
+    HEADER = '\033[96m'      # Cyan - step headers
+    PROMPT = '\033[93m'      # Yellow - user prompts
+    RESPONSE = '\033[92m'    # Green - AI responses
+    STATS = '\033[95m'       # Magenta - statistics
+    TODO = '\033[91m'        # Red - TODO items
+    BOLD = '\033[1m'
+    RESET = '\033[0m'
+
+
+# Decided once at import: without a TTY the helpers just return the text
+USE_COLOR = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+# Escape sequences are fixed, so each helper is a plain function over
+# module constants (no classmethod dispatch or attribute lookups per call).
+# With color off they are empty and the helpers leave the text as is.
+if USE_COLOR:
+    _HEADER_PREFIX = Colors.BOLD + Colors.HEADER
+    _PROMPT_PREFIX = Colors.PROMPT
+    _RESPONSE_PREFIX = Colors.RESPONSE
+    _STATS_PREFIX = Colors.STATS
+    _TODO_PREFIX = Colors.TODO
+    _RESET = Colors.RESET
+else:
+    _HEADER_PREFIX = _PROMPT_PREFIX = _RESPONSE_PREFIX = _STATS_PREFIX = _TODO_PREFIX = _RESET = ""
+
+
+def header(text):
+    return f"{_HEADER_PREFIX}{text}{_RESET}"
+
+
+def prompt(text):
+    return f"{_PROMPT_PREFIX}{text}{_RESET}"
+
+
+def response(text):
+    return f"{_RESPONSE_PREFIX}{text}{_RESET}"
+
+
+def stats(text):
+    return f"{_STATS_PREFIX}{text}{_RESET}"
+
+
+def todo(text):
+    return f"{_TODO_PREFIX}{text}{_RESET}"
+
+
+# Keep the Colors.header(...) call style used throughout the katas
+Colors.header = staticmethod(header)
+Colors.prompt = staticmethod(prompt)
+Colors.response = staticmethod(response)
+Colors.stats = staticmethod(stats)
+Colors.todo = staticmethod(todo)
@@ -0,0 +1,221 @@
+"""
+Faster CPU builds of the MiniLM embedding model used by the RAG katas.
+
+OnnxEmbedding is an int8 ONNX build, exported and quantized once, on first
+use, into ONNX_MODEL_DIR at the repository root and then shared by every
+kata that embeds with MiniLM. Needs optimum[onnxruntime] (ORT_AVAILABLE).
+
+BF16HuggingFaceEmbedding keeps the PyTorch model but runs it in bfloat16
+through Intel Extension for PyTorch. Needs intel-extension-for-pytorch
+(IPEX_AVAILABLE).
+
+Without either, the katas keep using the plain HuggingFaceEmbedding.
+
+Import this module directly rather than through workshop.common, so katas
+that only need colors don't load LlamaIndex.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.embeddings import BaseEmbedding
+from llama_index.core.schema import MetadataMode
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+# optimum runs MiniLM through ONNX Runtime with int8 weights
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+except ImportError:
+    ORTModelForFeatureExtraction = None
+
+ORT_AVAILABLE = ORTModelForFeatureExtraction is not None
+
+# IPEX fuses and repacks the encoder for bfloat16 matmuls (AVX512-BF16/AMX)
+try:
+    import intel_extension_for_pytorch as ipex
+except ImportError:
+    ipex = None
+
+IPEX_AVAILABLE = ipex is not None
+
+EMBED_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# MiniLM reads at most this many word pieces per input
+MAX_SEQ_LENGTH = 256
+
+# Where the int8 ONNX export of the embedding model is kept
+ONNX_MODEL_DIR = Path(__file__).resolve().parents[2] / ".onnx_minilm"
+ONNX_MODEL_FILE = "model_quantized.onnx"
+
+
+def configure_cpu_threads():
+    """
+    With RAG_FAST_CPU=1, give PyTorch every CPU core for embedding.
+
+    Off by default so a kata embedded in a larger process doesn't
+    oversubscribe cores that process is already using.
+    """
+    if os.environ.get("RAG_FAST_CPU") != "1":
+        return
+
+    import torch
+
+    torch.set_num_threads(os.cpu_count() or 1)
+    try:
+        torch.set_num_interop_threads(2)
+    except RuntimeError:
+        pass  # Only settable before torch runs any parallel work
+
+
+def pick_device() -> str:
+    """Return the best available torch device: cuda, mps or cpu."""
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def sort_for_embedding(nodes: list) -> list:
+    """
+    Return nodes ordered by the length of the text that gets embedded.
+
+    Each embedding batch is padded to its longest input, so grouping
+    similar lengths cuts the work spent on padding. Order doesn't matter
+    to a vector store, so the sorted list can be indexed as is.
+    """
+    return sorted(nodes, key=lambda node: len(node.get_content(metadata_mode=MetadataMode.EMBED)))
+
+
+def embedding_backend(embed_model) -> str:
+    """
+    Name the build that produces embed_model's vectors, e.g. "OnnxEmbedding"
+    or "HuggingFaceEmbedding/float16".
+
+    The int8 ONNX, fp16 GPU, bf16 IPEX and fp32 builds of MiniLM give
+    slightly different vectors, so a saved index records this name and is
+    rebuilt when it changes rather than mixing vectors from two builds.
+    """
+    name = type(embed_model).__name__
+    model = getattr(embed_model, "_model", None)
+    if model is not None and hasattr(model, "parameters"):
+        param = next(model.parameters(), None)
+        if param is not None:
+            name += "/" + str(param.dtype).removeprefix("torch.")
+    return name
+
+
+def export_quantized_model(save_dir: Path = ONNX_MODEL_DIR) -> Path:
+    """
+    Export MiniLM to ONNX and quantize it to int8, once.
+
+    Dynamic quantization needs no calibration data; the weights are
+    stored as int8 and activations are quantized on the fly, which uses
+    the VNNI dot-product instructions on recent x86 CPUs.
+
+    Args:
+        save_dir: Directory for the quantized model and its tokenizer
+
+    Returns:
+        save_dir, ready for OnnxEmbedding
+    """
+    if (save_dir / ONNX_MODEL_FILE).exists():
+        return save_dir
+
+    from transformers import AutoTokenizer
+
+    model = ORTModelForFeatureExtraction.from_pretrained(
+        EMBED_MODEL_NAME, export=True, provider="CPUExecutionProvider"
+    )
+    quantizer = ORTQuantizer.from_pretrained(model)
+    quantizer.quantize(
+        save_dir=save_dir,
+        quantization_config=AutoQuantizationConfig.avx512_vnni(
+            is_static=False, per_channel=True
+        ),
+    )
+    AutoTokenizer.from_pretrained(EMBED_MODEL_NAME).save_pretrained(save_dir)
+    return save_dir
+
+
+class OnnxEmbedding(BaseEmbedding):
+    """
+    MiniLM sentence embeddings served by ONNX Runtime.
+
+    Reproduces the sentence-transformers pipeline (mean pooling over the
+    attention mask, then L2 normalization) so vectors match the PyTorch
+    model closely enough to share an index. Tokenization uses the Rust
+    ("fast") tokenizer, which encodes a whole batch in one native call.
+    """
+
+    _tokenizer = PrivateAttr()
+    _model = PrivateAttr()
+
+    def __init__(self, model_dir: Path = ONNX_MODEL_DIR, **kwargs):
+        from transformers import AutoTokenizer
+
+        super().__init__(model_name=EMBED_MODEL_NAME, **kwargs)
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        self._model = ORTModelForFeatureExtraction.from_pretrained(
+            model_dir, file_name=ONNX_MODEL_FILE, provider="CPUExecutionProvider"
+        )
+
+    def _embed(self, texts: list[str]) -> list[list[float]]:
+        inputs = self._tokenizer(
+            texts, padding=True, truncation=True, max_length=MAX_SEQ_LENGTH, return_tensors="np"
+        )
+        hidden = self._model(**inputs).last_hidden_state
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.linalg.norm(pooled, axis=1, keepdims=True)
+        return pooled.tolist()
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        return self._embed([query])[0]
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        return self._embed([text])[0]
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        return self._embed(texts)
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        return self._get_query_embedding(query)
+
+
+class BF16HuggingFaceEmbedding(HuggingFaceEmbedding):
+    """
+    MiniLM on CPU in bfloat16, optimized by Intel Extension for PyTorch.
+
+    bfloat16 keeps fp32's exponent range, so embeddings stay effectively
+    unchanged while weights and activations take half the memory traffic.
+    """
+
+    def __init__(self, **kwargs):
+        import torch
+
+        super().__init__(model_name=EMBED_MODEL_NAME, device="cpu", **kwargs)
+        self._model = ipex.optimize(self._model.eval(), dtype=torch.bfloat16)
+
+    @staticmethod
+    def _bf16():
+        import torch
+
+        return torch.autocast("cpu", dtype=torch.bfloat16)
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        with self._bf16():
+            return super()._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        with self._bf16():
+            return super()._get_text_embedding(text)
+
+    def _get_text_embeddings(self, texts: list[str]) -> list[list[float]]:
+        with self._bf16():
+            return super()._get_text_embeddings(texts)
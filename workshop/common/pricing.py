@@ -0,0 +1,27 @@
+"""
+Claude model prices used by the katas' cost reports.
+
+Kept in one place so a price change is made once for every kata.
+"""
+
+# USD per million tokens. Cache writes (5-minute TTL) cost 1.25x the
+# input rate and cache reads 0.1x.
+MODEL_PRICING = {
+    "claude-sonnet-4-20250514": {
+        "name": "Sonnet 4", "input": 3.00, "output": 15.00, "cache_write": 3.75, "cache_read": 0.30,
+    },
+    "claude-haiku-4-5-20251001": {
+        "name": "Haiku 4.5", "input": 1.00, "output": 5.00, "cache_write": 1.25, "cache_read": 0.10,
+    },
+}
+
+
+def estimate_cost(model, input_tokens, output_tokens, cache_creation=0, cache_read=0):
+    """Estimate the dollar cost of a call using MODEL_PRICING."""
+    price = MODEL_PRICING[model]
+    return (
+        input_tokens * price["input"]
+        + output_tokens * price["output"]
+        + cache_creation * price["cache_write"]
+        + cache_read * price["cache_read"]
+    ) / 1_000_000
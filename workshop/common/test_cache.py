@@ -0,0 +1,86 @@
+"""
+Unit tests for the ttl_cache decorator
+
+Run with: pytest workshop/common/test_cache.py -v
+"""
+
+import pytest
+
+from workshop.common.cache import ttl_cache
+
+
+class TestTTLCache:
+    """Tests for ttl_cache."""
+
+    def test_repeated_call_is_cached(self):
+        calls = []
+
+        @ttl_cache(60)
+        def lookup(key):
+            calls.append(key)
+            return key.upper()
+
+        assert lookup("a") == "A"
+        assert lookup("a") == "A"
+        assert calls == ["a"]
+
+    def test_arguments_are_cached_separately(self):
+        calls = []
+
+        @ttl_cache(60)
+        def lookup(key, suffix=""):
+            calls.append((key, suffix))
+            return key + suffix
+
+        lookup("a")
+        lookup("b")
+        lookup("a", suffix="!")
+        lookup("a", suffix="!")
+        assert calls == [("a", ""), ("b", ""), ("a", "!")]
+
+    def test_expired_entry_is_recomputed(self):
+        calls = []
+
+        @ttl_cache(0)
+        def lookup():
+            calls.append(1)
+            return len(calls)
+
+        assert lookup() == 1
+        assert lookup() == 2
+
+    def test_exceptions_are_not_cached(self):
+        calls = []
+
+        @ttl_cache(60)
+        def lookup():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("temporary failure")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            lookup()
+        assert lookup() == "ok"
+        assert lookup() == "ok"
+        assert len(calls) == 2
+
+    def test_cache_clear(self):
+        calls = []
+
+        @ttl_cache(60)
+        def lookup():
+            calls.append(1)
+            return len(calls)
+
+        assert lookup() == 1
+        lookup.cache_clear()
+        assert lookup() == 2
+
+    def test_wraps_function_metadata(self):
+        @ttl_cache(60)
+        def lookup():
+            """Docstring."""
+
+        assert lookup.__name__ == "lookup"
+        assert lookup.__doc__ == "Docstring."
@@ -0,0 +1,87 @@
+"""
+Unit tests for the calculate() evaluator
+
+Run with: pytest workshop/common/test_calc.py -v
+
+The size-guard tests would hang (not fail) if a guard regressed, since
+the unguarded computations take minutes or exhaust memory.
+"""
+
+import math
+import pytest
+
+from workshop.common.calc import MAX_EXPONENT, checked_pow, evaluate
+
+
+class TestEvaluate:
+    """Tests for ordinary expressions."""
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("2 + 2", 4),
+        ("10 * 5 - 3", 47),
+        ("7 // 2 + 7 % 2", 4),
+        ("-3 ** 2", -9),
+        ("sqrt(16)", 4.0),
+        ("max(1, 5, 3)", 5),
+        ("sum((1, 2, 3))", 6),
+        ("round(pi, 2)", 3.14),
+        ("pow(2, 10)", 1024),
+        ("9 ** 999 % 7", pow(9, 999, 7)),
+    ])
+    def test_arithmetic(self, expression, expected):
+        assert evaluate(expression) == expected
+
+    def test_float_result(self):
+        assert math.isclose(evaluate("sin(pi / 2)"), 1.0)
+
+    def test_division_by_zero_raises(self):
+        with pytest.raises(ZeroDivisionError):
+            evaluate("1 / 0")
+
+    @pytest.mark.parametrize("expression", [
+        "__import__('os')",
+        "open('/etc/passwd')",
+        "(1).__class__",
+        "[x for x in (1, 2)]",
+        "'a' * 3",
+        "abs(x=1)",
+        "lambda: 1",
+    ])
+    def test_rejects_disallowed_syntax(self, expression):
+        with pytest.raises(ValueError):
+            evaluate(expression)
+
+
+class TestSizeGuards:
+    """Expressions that would pin the CPU or exhaust memory are refused."""
+
+    def test_large_exponent_operator(self):
+        with pytest.raises(ValueError, match="Exponent too large"):
+            evaluate("9 ** 10 ** 9")
+
+    def test_large_exponent_pow_function(self):
+        with pytest.raises(ValueError, match="Exponent too large"):
+            evaluate("pow(9, 10 ** 9)")
+
+    def test_nested_powers(self):
+        with pytest.raises(ValueError, match="Result too large"):
+            evaluate("((9 ** 999) ** 999) ** 999")
+
+    def test_large_base(self):
+        with pytest.raises(ValueError, match="Result too large"):
+            evaluate(f"(2 ** 1000) ** {MAX_EXPONENT}")
+
+    def test_tuple_repetition(self):
+        with pytest.raises(ValueError, match="only work on numbers"):
+            evaluate("(1,) * 10 ** 9")
+
+    def test_tuple_from_function_repetition(self):
+        with pytest.raises(ValueError, match="only work on numbers"):
+            evaluate("max((1,), (2,)) * 10 ** 9")
+
+    def test_round_huge_ndigits(self):
+        with pytest.raises(ValueError, match="ndigits too large"):
+            evaluate("round(5, -10 ** 9)")
+
+    def test_checked_pow_allows_float_powers(self):
+        assert checked_pow(2.0, 0.5) == math.sqrt(2.0)
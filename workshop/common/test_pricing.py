@@ -0,0 +1,31 @@
+"""
+Unit tests for the shared model pricing table
+
+Run with: pytest workshop/common/test_pricing.py -v
+"""
+
+import math
+import pytest
+
+from workshop.common.pricing import MODEL_PRICING, estimate_cost
+
+
+class TestEstimateCost:
+    """Tests for estimate_cost."""
+
+    def test_haiku_input_and_output(self):
+        assert math.isclose(estimate_cost("claude-haiku-4-5-20251001", 1_000_000, 1_000_000), 6.0)
+
+    def test_cache_tokens_use_cache_rates(self):
+        cost = estimate_cost("claude-sonnet-4-20250514", 0, 0, cache_creation=1_000_000, cache_read=1_000_000)
+        assert math.isclose(cost, 3.75 + 0.30)
+
+    @pytest.mark.parametrize("model", MODEL_PRICING)
+    def test_cache_rates_follow_input_rate(self, model):
+        price = MODEL_PRICING[model]
+        assert math.isclose(price["cache_write"], price["input"] * 1.25)
+        assert math.isclose(price["cache_read"], price["input"] * 0.1)
+
+    def test_unknown_model_raises(self):
+        with pytest.raises(KeyError):
+            estimate_cost("claude-unknown", 1, 1)
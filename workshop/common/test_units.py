@@ -0,0 +1,38 @@
+"""
+Unit tests for the temperature conversion table
+
+Run with: pytest workshop/common/test_units.py -v
+"""
+
+import math
+import pytest
+
+from workshop.common.units import TEMP_UNITS, convert_temp
+
+
+class TestConvertTemp:
+    """Tests for convert_temp."""
+
+    @pytest.mark.parametrize("value, from_unit, to_unit, expected", [
+        (100, "C", "F", 212.0),
+        (32, "F", "C", 0.0),
+        (0, "C", "K", 273.15),
+        (0, "K", "F", -459.67),
+        (20, "c", "f", 68.0),
+    ])
+    def test_known_values(self, value, from_unit, to_unit, expected):
+        assert math.isclose(convert_temp(value, from_unit, to_unit), expected, abs_tol=1e-9)
+
+    @pytest.mark.parametrize("from_unit", TEMP_UNITS)
+    @pytest.mark.parametrize("to_unit", TEMP_UNITS)
+    def test_round_trip(self, from_unit, to_unit):
+        there = convert_temp(37.5, from_unit, to_unit)
+        assert math.isclose(convert_temp(there, to_unit, from_unit), 37.5)
+
+    def test_unknown_source_unit(self):
+        with pytest.raises(ValueError, match="Unknown source unit: X"):
+            convert_temp(1, "x", "C")
+
+    def test_unknown_target_unit(self):
+        with pytest.raises(ValueError, match="Unknown target unit: R"):
+            convert_temp(1, "C", "R")
@@ -0,0 +1,23 @@
+"""
+Helpers for the per-kata unit tests.
+"""
+
+import importlib.util
+from pathlib import Path
+
+
+def load_kata_module(test_file: str, filename: str = "solution.py"):
+    """
+    Import filename from the kata directory that holds test_file.
+
+    Every kata has a solution.py, so a plain `import solution` would hand
+    all the test files whichever one was imported first. The module is
+    registered under a name derived from its kata directory instead, e.g.
+    kata_05_rag_agent_solution.
+    """
+    path = Path(test_file).resolve().parent / filename
+    name = f"{path.parent.name}_{path.stem}".replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,34 @@
+"""
+Temperature conversion behind the convert_temperature() tools.
+"""
+
+# Units convert_temp() accepts
+TEMP_UNITS = ("C", "F", "K")
+
+# Direct formula for every (from, to) unit pair, so a conversion is a
+# single lookup instead of a round trip through Celsius
+_TEMP_CONVERSIONS = {
+    ("C", "C"): lambda v: v,
+    ("C", "F"): lambda v: v * 9 / 5 + 32,
+    ("C", "K"): lambda v: v + 273.15,
+    ("F", "C"): lambda v: (v - 32) * 5 / 9,
+    ("F", "F"): lambda v: v,
+    ("F", "K"): lambda v: (v - 32) * 5 / 9 + 273.15,
+    ("K", "C"): lambda v: v - 273.15,
+    ("K", "F"): lambda v: (v - 273.15) * 9 / 5 + 32,
+    ("K", "K"): lambda v: v,
+}
+
+
+def convert_temp(value: float, from_unit: str, to_unit: str) -> float:
+    """Convert value from from_unit to to_unit (C, F or K, any case).
+
+    Raises:
+        ValueError: If either unit is unknown; the message names which.
+    """
+    convert = _TEMP_CONVERSIONS.get((from_unit.upper(), to_unit.upper()))
+    if convert is None:
+        if from_unit.upper() not in TEMP_UNITS:
+            raise ValueError(f"Unknown source unit: {from_unit.upper()}. Use C, F, or K.")
+        raise ValueError(f"Unknown target unit: {to_unit.upper()}. Use C, F, or K.")
+    return convert(value)